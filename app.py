@@ -2,13 +2,9 @@ import streamlit as st
 import pandas as pd
 import tempfile
 import os
-import plotly.express as px
-from test import (
-    preprocesar_datos,
-    crear_reporte_base,
-    procesar_referencias_ppi,
-    calcular_dias_en_calle
-)
+
+# Las etapas del proceso y plotly se importan dentro de cada página para que
+# la aplicación arranque sin cargar módulos que la página elegida no usa.
 
 def inicializar_estado():
     """Inicializa las variables de sesión al cargar la aplicación."""
@@ -19,6 +15,18 @@ def inicializar_estado():
 
 def pagina_generacion_reporte():
     """Página para generar el reporte inicial"""
+    from test import (
+        configurar_pandas,
+        preprocesar_datos,
+        crear_reporte_base,
+        procesar_referencias_ppi,
+        calcular_importes_por_dias,
+        calcular_dias_en_calle
+    )
+    from src.validaciones import validar_resultados
+    from src.procedencia import marcar_nivel
+
+    configurar_pandas()
     st.title("📊 Generador de Reporte de Días en Calle")
     
     # Instrucciones
@@ -66,7 +74,13 @@ def pagina_generacion_reporte():
                     reporte_procesado, asientos_no_encontrados = procesar_referencias_ppi(
                         reporte_base, dfs_procesados['mayor_ppi']
                     )
+                    # Como en ejecutar_pipeline, se registra el nivel de coincidencia de cada fila
+                    reporte_procesado = marcar_nivel(reporte_procesado, 'referencia_ppi')
+                    asientos_no_encontrados = asientos_no_encontrados.drop(columns='procedencia', errors='ignore')
+                    facturas_no_encontradas = facturas_no_encontradas.drop(columns='procedencia', errors='ignore')
+                    reporte_procesado = calcular_importes_por_dias(reporte_procesado)
                     resultado_final = calcular_dias_en_calle(reporte_procesado)
+                    excepciones = validar_resultados(resultado_final, reporte_procesado)
                     
                     # Crear archivo temporal
                     with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
@@ -75,6 +89,7 @@ def pagina_generacion_reporte():
                             reporte_procesado.to_excel(writer, sheet_name='Detalle del Reporte', index=False)
                             asientos_no_encontrados.to_excel(writer, sheet_name='Asientos No Encontrados', index=False)
                             facturas_no_encontradas.to_excel(writer, sheet_name='Facturas No Encontradas', index=False)
+                            excepciones.to_excel(writer, sheet_name='Excepciones', index=False)
                     
                     # Leer el archivo temporal y mostrarlo para descarga
                     with open(tmp.name, 'rb') as f:
@@ -95,6 +110,8 @@ def pagina_generacion_reporte():
 
 def pagina_analisis_reporte():
     """Página para análisis de reporte descargado"""
+    import plotly.express as px
+
     st.title("🔍 Análisis de Reporte de Días en Calle")
     
     # Cargar archivo de reporte
@@ -172,9 +189,12 @@ def pagina_analisis_reporte():
             if clientes_seleccionados:
                 st.subheader("Detalles de Clientes Seleccionados")
                 
+                # Un único agrupamiento en lugar de filtrar el reporte completo por cada cliente
+                por_cliente = dict(tuple(df_filtrado.groupby('Nombre', sort=False)))
+                
                 for cliente in clientes_seleccionados:
                     # Datos específicos del cliente
-                    df_cliente = df_filtrado[df_filtrado['Nombre'] == cliente]
+                    df_cliente = por_cliente.get(cliente, df_filtrado.iloc[:0])
                     
                     # Métricas del cliente
                     col1, col2, col3 = st.columns(3)
@@ -196,6 +216,80 @@ def pagina_analisis_reporte():
         except Exception as e:
             st.error(f"Error al cargar el archivo: {str(e)}")
 
+def pagina_historico():
+    """Página para analizar la evolución histórica guardada en el almacén local"""
+    import plotly.express as px
+    from src.almacen_historico import RUTA_ALMACEN_POR_DEFECTO
+    from src.metricas_incrementales import (
+        ventanas_moviles,
+        antiguedad_por_cliente,
+        tendencia_por_cliente,
+        tendencia_movil
+    )
+
+    st.title("📈 Histórico de Días en Calle")
+
+    if not os.path.exists(RUTA_ALMACEN_POR_DEFECTO):
+        st.info("Todavía no hay corridas guardadas en el histórico")
+        return
+
+    try:
+        # Evolución de toda la empresa
+        df_empresa = tendencia_movil(RUTA_ALMACEN_POR_DEFECTO)
+
+        if df_empresa.empty:
+            st.info("Todavía no hay corridas guardadas en el histórico")
+            return
+
+        st.subheader("Días en Calle de la Empresa")
+
+        # Ventanas móviles de 30, 90 y 365 días
+        df_ventanas = ventanas_moviles(ruta=RUTA_ALMACEN_POR_DEFECTO)
+        if not df_ventanas.empty:
+            columnas_ventanas = st.columns(len(df_ventanas))
+            for columna, (_, ventana) in zip(columnas_ventanas, df_ventanas.iterrows()):
+                with columna:
+                    st.metric(f"Últimos {ventana['ventana']} días", f"{ventana['dias_en_calle_ponderados']:.2f}")
+
+        grafico_empresa = px.line(
+            df_empresa,
+            x='periodo',
+            y=['dias_en_calle_ponderados', 'dias_en_calle_movil'],
+            markers=True,
+            title="Días en Calle ponderados por importe"
+        )
+        st.plotly_chart(grafico_empresa, use_container_width=True)
+
+        # Evolución por cliente
+        df_clientes = tendencia_por_cliente(RUTA_ALMACEN_POR_DEFECTO)
+        clientes_seleccionados = st.multiselect(
+            "Seleccionar Clientes",
+            options=sorted(df_clientes['Nombre'].dropna().unique().tolist())
+        )
+
+        if clientes_seleccionados:
+            df_clientes = df_clientes[df_clientes['Nombre'].isin(clientes_seleccionados)]
+            grafico_clientes = px.line(
+                df_clientes,
+                x='periodo',
+                y='dias_en_calle_ponderados',
+                color='Nombre',
+                markers=True,
+                title="Días en Calle por Cliente"
+            )
+            st.plotly_chart(grafico_clientes, use_container_width=True)
+            st.dataframe(df_clientes, hide_index=True)
+
+            # Importe cobrado por tramo de días para cobrar
+            df_antiguedad = antiguedad_por_cliente(RUTA_ALMACEN_POR_DEFECTO)
+            st.dataframe(
+                df_antiguedad[df_antiguedad['Nombre'].isin(clientes_seleccionados)],
+                hide_index=True
+            )
+
+    except Exception as e:
+        st.error(f"Error al consultar el histórico: {str(e)}")
+
 def main():
     # Configuración de página
     st.set_page_config(
@@ -209,13 +303,15 @@ def main():
     
     # Definir páginas de la aplicación
     pagina = st.sidebar.radio("Seleccionar Página", 
-                               ["Generación de Reporte", "Análisis de Reporte"])
+                               ["Generación de Reporte", "Análisis de Reporte", "Histórico"])
     
     # Mostrar la página seleccionada
     if pagina == "Generación de Reporte":
         pagina_generacion_reporte()
-    else:
+    elif pagina == "Análisis de Reporte":
         pagina_analisis_reporte()
+    else:
+        pagina_historico()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""
+Punto de entrada de línea de comandos para el reporte de días en calle.
+
+Los módulos pesados (pandas y las etapas del proceso) se importan dentro de cada
+subcomando, de modo que listar o validar entradas no paga su tiempo de carga.
+
+Ejemplos:
+    python cli.py listar
+    python cli.py validar --mayor-ppi "./data/cierres/*cobros totales*.xlsx"
+    python cli.py ejecutar --salida ./data/reporte_enero.xlsx
+    python cli.py ejecutar --por-cliente ./data/por_cliente --solo-por-cliente
+    python cli.py benchmark
+    python cli.py calentar-cache
+    python cli.py comparar ./data/reporte_enero.xlsx ./data/reporte_dias_en_calle.xlsx
+    python cli.py procedencia ./data/reporte_dias_en_calle.xlsx FA100-00142506
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+from typing import Dict
+
+from src.entradas import (
+    ARCHIVOS_ENTRADA, DIRECTORIO_POR_CLIENTE_POR_DEFECTO, RUTA_SALIDA_POR_DEFECTO, resolver_ruta, resolver_rutas
+)
+
+
+def _periodo(valor: str) -> str:
+    """Valida un periodo en formato AAAA-MM."""
+    try:
+        datetime.strptime(valor, '%Y-%m')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"periodo inválido '{valor}', se espera AAAA-MM")
+    return valor
+
+
+def _rutas_indicadas(args: argparse.Namespace) -> Dict[str, str]:
+    """Devuelve las rutas o patrones de entrada indicados por línea de comandos."""
+    return {clave: getattr(args, clave) for clave in ARCHIVOS_ENTRADA if getattr(args, clave, None)}
+
+
+def comando_listar(args: argparse.Namespace) -> int:
+    """Lista los archivos de entrada que usaría una corrida."""
+    rutas = _rutas_indicadas(args)
+    for clave, archivo in ARCHIVOS_ENTRADA.items():
+        patron = rutas.get(clave, archivo['ruta'])
+        try:
+            ruta = resolver_ruta(patron)
+            tamanio = os.path.getsize(ruta) / 1024
+            print(f"{archivo['descripcion']:<22} {ruta} ({tamanio:,.0f} KB)")
+        except FileNotFoundError:
+            print(f"{archivo['descripcion']:<22} NO ENCONTRADO: {patron}")
+    return 0
+
+
+def comando_validar(args: argparse.Namespace) -> int:
+    """Verifica que todas las entradas existan y tengan el encabezado esperado, sin leer sus datos."""
+    from src.validar_entradas import verificar_archivo
+
+    errores = []
+    rutas = _rutas_indicadas(args)
+    for clave, archivo in ARCHIVOS_ENTRADA.items():
+        patron = rutas.get(clave, archivo['ruta'])
+        try:
+            ruta = resolver_ruta(patron)
+        except FileNotFoundError as e:
+            errores.append(f"{archivo['descripcion']}: {e}")
+            continue
+        errores.extend(verificar_archivo(clave, ruta))
+
+    if errores:
+        print("Entradas inválidas:\n" + "\n".join(f"  - {error}" for error in errores))
+        return 1
+
+    print("Entradas válidas")
+    return 0
+
+
+def comando_ejecutar(args: argparse.Namespace) -> int:
+    """Genera el reporte completo."""
+    from test import main
+    from src.validar_entradas import ErrorEntradaInvalida
+
+    directorio_por_cliente = args.por_cliente
+    if args.solo_por_cliente and not directorio_por_cliente:
+        directorio_por_cliente = DIRECTORIO_POR_CLIENTE_POR_DEFECTO
+
+    try:
+        main(_rutas_indicadas(args), args.salida, guardar_historico=not args.sin_historico,
+             directorio_por_cliente=directorio_por_cliente, reporte_completo=not args.solo_por_cliente,
+             procesos=args.procesos, periodo=args.periodo)
+    except ErrorEntradaInvalida as e:
+        print(e)
+        return 1
+    return 0
+
+
+def comando_benchmark(args: argparse.Namespace) -> int:
+    """Mide duración y pico de memoria de cada etapa sin escribir salidas."""
+    import pandas as pd
+    from test import configurar_pandas, cargar_archivos, preprocesar_datos, ejecutar_pipeline, ejecutar_etapa
+
+    configurar_pandas()
+    rutas = _rutas_indicadas(args)
+
+    for repeticion in range(1, args.repeticiones + 1):
+        mediciones = {}
+        dfs = ejecutar_etapa('cargar_archivos', cargar_archivos, rutas, mediciones=mediciones)
+        dfs = ejecutar_etapa('preprocesar_datos', preprocesar_datos, dfs, mediciones=mediciones)
+        ejecutar_pipeline(dfs, mediciones)
+
+        tabla = pd.DataFrame(mediciones).T
+        tabla.loc['total'] = [tabla['segundos'].sum(), tabla['pico_MB'].max()]
+        print(f"\nRepetición {repeticion}:\n{tabla.round(3).to_string()}")
+    return 0
+
+
+def comando_calentar_cache(args: argparse.Namespace) -> int:
+    """Convierte los Excel de entrada a Parquet para acelerar las próximas corridas."""
+    from utils.cache_entradas import calentar_cache
+
+    for clave, ruta in resolver_rutas(_rutas_indicadas(args)).items():
+        cacheado = calentar_cache(ruta, ARCHIVOS_ENTRADA[clave]['skiprows'])
+        print(f"{ARCHIVOS_ENTRADA[clave]['descripcion']:<22} {'cacheado' if cacheado else 'sin caché'}: {ruta}")
+    return 0
+
+
+def comando_comparar(args: argparse.Namespace) -> int:
+    """Compara el indicador por factura de dos corridas."""
+    import pandas as pd
+    from src.comparar_corridas import leer_corrida, comparar_corridas, resumen_comparacion, guardar_comparacion
+
+    diferencias = comparar_corridas(leer_corrida(args.anterior), leer_corrida(args.actual),
+                                    columnas=args.columnas, decimales=args.decimales)
+    print(resumen_comparacion(diferencias).to_string())
+
+    modificadas = diferencias['modificadas']
+    if args.mostrar > 0 and 'delta_cantidad_de_dias_en_calle' in modificadas and not modificadas.empty:
+        mayores = modificadas.reindex(
+            modificadas['delta_cantidad_de_dias_en_calle'].abs().sort_values(ascending=False).index
+        ).head(args.mostrar)
+        with pd.option_context('display.width', 200):
+            print(f"\nMayores cambios en días en calle:\n{mayores.to_string(index=False)}")
+
+    if args.salida:
+        guardar_comparacion(diferencias, args.salida)
+        print(f"\nDiferencias guardadas en {args.salida}")
+    return 0
+
+
+def comando_procedencia(args: argparse.Namespace) -> int:
+    """Muestra de qué archivo, fila y nivel de coincidencia proviene cada línea de una factura."""
+    import pandas as pd
+    from src.procedencia import procedencia_de_factura
+
+    detalle = pd.read_excel(args.reporte, sheet_name='Detalle del Reporte', dtype={'nro_factura': str})
+    if 'procedencia' not in detalle.columns:
+        print(f"El reporte '{args.reporte}' no tiene la columna de procedencia")
+        return 1
+
+    filas = procedencia_de_factura(detalle, args.factura)
+    if filas.empty:
+        print(f"La factura {args.factura} no está en el detalle del reporte")
+        return 1
+
+    columnas = ['nro_factura', 'Referencia', 'Fecha', 'Haber', 'nivel', 'descripcion', 'fila_excel']
+    with pd.option_context('display.width', 200):
+        print(filas[[columna for columna in columnas if columna in filas.columns]].to_string(index=False))
+    return 0
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Crea el parser con todos los subcomandos."""
+    entradas = argparse.ArgumentParser(add_help=False)
+    for clave, archivo in ARCHIVOS_ENTRADA.items():
+        entradas.add_argument(
+            '--' + clave.replace('_', '-'),
+            dest=clave,
+            metavar='RUTA',
+            help=f"Ruta o patrón glob de {archivo['descripcion']} (por defecto: {archivo['ruta']})"
+        )
+
+    parser = argparse.ArgumentParser(description='Reporte de días en calle')
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    listar = subcomandos.add_parser('listar', aliases=['list'], parents=[entradas],
+                                    help='Lista los archivos de entrada')
+    listar.set_defaults(funcion=comando_listar)
+
+    validar = subcomandos.add_parser('validar', aliases=['validate'], parents=[entradas],
+                                     help='Valida los archivos de entrada')
+    validar.set_defaults(funcion=comando_validar)
+
+    ejecutar = subcomandos.add_parser('ejecutar', aliases=['run'], parents=[entradas],
+                                      help='Genera el reporte')
+    ejecutar.add_argument('--salida', default=RUTA_SALIDA_POR_DEFECTO,
+                          help='Ruta del Excel de salida')
+    ejecutar.add_argument('--sin-historico', action='store_true',
+                          help='No agrega la corrida al histórico')
+    ejecutar.add_argument('--periodo', type=_periodo,
+                          help='Periodo AAAA-MM con el que se guarda la corrida en el histórico '
+                               '(por defecto el mes con más líneas cobradas)')
+    ejecutar.add_argument('--por-cliente', nargs='?', const=DIRECTORIO_POR_CLIENTE_POR_DEFECTO,
+                          metavar='DIRECTORIO',
+                          help=f'Guarda además un libro por cliente y un índice '
+                               f'(por defecto en {DIRECTORIO_POR_CLIENTE_POR_DEFECTO})')
+    ejecutar.add_argument('--solo-por-cliente', action='store_true',
+                          help='Escribe sólo los libros por cliente, sin el Excel completo')
+    ejecutar.add_argument('--procesos', type=int,
+                          help='Procesos para escribir los libros por cliente (por defecto uno por núcleo)')
+    ejecutar.set_defaults(funcion=comando_ejecutar)
+
+    benchmark = subcomandos.add_parser('benchmark', parents=[entradas],
+                                       help='Mide duración y memoria de cada etapa')
+    benchmark.add_argument('--repeticiones', type=int, default=1)
+    benchmark.set_defaults(funcion=comando_benchmark)
+
+    calentar = subcomandos.add_parser('calentar-cache', aliases=['cache-warm'], parents=[entradas],
+                                      help='Convierte las entradas a Parquet')
+    calentar.set_defaults(funcion=comando_calentar_cache)
+
+    comparar = subcomandos.add_parser('comparar', aliases=['diff'],
+                                      help='Compara el indicador por factura de dos corridas')
+    comparar.add_argument('anterior', help='Excel de salida o Parquet de la corrida anterior')
+    comparar.add_argument('actual', help='Excel de salida o Parquet de la corrida actual')
+    comparar.add_argument('--columnas', nargs='+', metavar='COLUMNA',
+                          help='Columnas a comparar (por defecto todas las comunes)')
+    comparar.add_argument('--decimales', type=int, default=2,
+                          help='Decimales a los que se redondean los importes antes de comparar')
+    comparar.add_argument('--mostrar', type=int, default=20,
+                          help='Cantidad de facturas con mayor cambio a mostrar')
+    comparar.add_argument('--salida', help='Excel donde guardar todas las diferencias')
+    comparar.set_defaults(funcion=comando_comparar)
+
+    procedencia = subcomandos.add_parser('procedencia', aliases=['lineage'],
+                                         help='Muestra el origen de cada línea de una factura')
+    procedencia.add_argument('reporte', help='Excel de salida de la corrida')
+    procedencia.add_argument('factura', help='Número de factura, por ejemplo FA100-00142506')
+    procedencia.set_defaults(funcion=comando_procedencia)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = crear_parser().parse_args(argv)
+    # Una entrada o corrida inexistente se informa igual en todos los subcomandos
+    try:
+        return args.funcion(args)
+    except FileNotFoundError as e:
+        print(e)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
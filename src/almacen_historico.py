@@ -0,0 +1,192 @@
+import sqlite3
+from datetime import datetime
+from typing import List, Optional
+
+import pandas as pd
+
+RUTA_ALMACEN_POR_DEFECTO = './data/historico_dias_en_calle.sqlite'
+
+COLUMNAS_INDICADOR = [
+    'Nombre', 'nro_recibo', 'TotalFactura', 'Pago', 'Asiento', 'nro_factura',
+    'Referencia', 'cantidad_de_dias_en_calle', 'control_pago_total'
+]
+
+COLUMNAS_DETALLE = [
+    'Nombre', 'nro_recibo', 'Pago', 'Asiento', 'nro_factura', 'FechaFactura',
+    'Nombre cuenta', 'Referencia', 'Fecha', 'Haber',
+    'cantidad_de_dias_para_cobrar', 'importe_por_dias'
+]
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS corridas (
+    corrida_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    periodo TEXT NOT NULL,
+    fecha_ejecucion TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS indicador_por_factura (
+    corrida_id INTEGER NOT NULL REFERENCES corridas(corrida_id),
+    periodo TEXT NOT NULL,
+    "Nombre" TEXT,
+    "nro_recibo" TEXT,
+    "TotalFactura" REAL,
+    "Pago" REAL,
+    "Asiento" TEXT,
+    "nro_factura" TEXT,
+    "Referencia" TEXT,
+    "cantidad_de_dias_en_calle" REAL,
+    "control_pago_total" REAL
+);
+
+CREATE TABLE IF NOT EXISTS detalle_reporte (
+    corrida_id INTEGER NOT NULL REFERENCES corridas(corrida_id),
+    periodo TEXT NOT NULL,
+    "Nombre" TEXT,
+    "nro_recibo" TEXT,
+    "Pago" REAL,
+    "Asiento" TEXT,
+    "nro_factura" TEXT,
+    "FechaFactura" TEXT,
+    "Nombre cuenta" TEXT,
+    "Referencia" TEXT,
+    "Fecha" TEXT,
+    "Haber" REAL,
+    "cantidad_de_dias_para_cobrar" REAL,
+    "importe_por_dias" REAL
+);
+
+CREATE INDEX IF NOT EXISTS ix_indicador_nombre ON indicador_por_factura("Nombre");
+CREATE INDEX IF NOT EXISTS ix_indicador_factura ON indicador_por_factura("nro_factura");
+CREATE INDEX IF NOT EXISTS ix_indicador_periodo ON indicador_por_factura(periodo);
+CREATE INDEX IF NOT EXISTS ix_indicador_asiento ON indicador_por_factura("Asiento");
+CREATE INDEX IF NOT EXISTS ix_detalle_nombre ON detalle_reporte("Nombre");
+CREATE INDEX IF NOT EXISTS ix_detalle_factura ON detalle_reporte("nro_factura");
+CREATE INDEX IF NOT EXISTS ix_detalle_periodo ON detalle_reporte(periodo);
+CREATE INDEX IF NOT EXISTS ix_detalle_asiento ON detalle_reporte("Asiento");
+"""
+
+
+def conectar_almacen(ruta: str = RUTA_ALMACEN_POR_DEFECTO) -> sqlite3.Connection:
+    """
+    Abre el almacén histórico y crea las tablas e índices si no existen.
+
+    Args:
+        ruta: Ruta del archivo SQLite
+
+    Returns:
+        sqlite3.Connection: Conexión abierta al almacén
+    """
+    conexion = sqlite3.connect(ruta)
+    conexion.executescript(_ESQUEMA)
+    return conexion
+
+
+def _preparar_para_almacen(df: pd.DataFrame, columnas: List[str], corrida_id: int, periodo: str) -> pd.DataFrame:
+    """Selecciona las columnas del almacén y normaliza claves y fechas a texto."""
+    df = df.reindex(columns=columnas)
+
+    for columna in ('Nombre', 'nro_recibo', 'Asiento', 'nro_factura', 'Nombre cuenta', 'Referencia'):
+        if columna in df.columns:
+            df[columna] = df[columna].astype(object).map(lambda valor: None if pd.isna(valor) else str(valor))
+
+    for columna in ('FechaFactura', 'Fecha'):
+        if columna in df.columns:
+            df[columna] = pd.to_datetime(df[columna]).dt.strftime('%Y-%m-%d')
+
+    df.insert(0, 'periodo', periodo)
+    df.insert(0, 'corrida_id', corrida_id)
+    return df
+
+
+def guardar_corrida(resultado: pd.DataFrame, reporte_detallado: pd.DataFrame, periodo: str,
+                    ruta: str = RUTA_ALMACEN_POR_DEFECTO) -> int:
+    """
+    Agrega los resultados de una corrida al almacén histórico.
+
+    Una corrida reemplaza a las anteriores del mismo periodo (por ejemplo, al volver a
+    correr un mes re-exportado). Como los extractos de periodos consecutivos se superponen,
+    una misma factura puede quedar en dos periodos: las tendencias se calculan con las
+    métricas de src.metricas_incrementales, que reemplazan por fecha de cobro.
+
+    Args:
+        resultado: DataFrame 'Indicador por Factura'
+        reporte_detallado: DataFrame 'Detalle del Reporte'
+        periodo: Periodo de la corrida en formato 'AAAA-MM'
+        ruta: Ruta del archivo SQLite
+
+    Returns:
+        int: Identificador de la corrida guardada
+    """
+    print(f"Guardando corrida del periodo {periodo} en el histórico...")
+
+    with conectar_almacen(ruta) as conexion:
+        # Dentro de la misma transacción que la inserción
+        for tabla in ('indicador_por_factura', 'detalle_reporte', 'corridas'):
+            conexion.execute(f'DELETE FROM {tabla} WHERE periodo = ?', (periodo,))
+
+        cursor = conexion.execute(
+            'INSERT INTO corridas (periodo, fecha_ejecucion) VALUES (?, ?)',
+            (periodo, datetime.now().isoformat(timespec='seconds'))
+        )
+        corrida_id = cursor.lastrowid
+
+        _preparar_para_almacen(resultado, COLUMNAS_INDICADOR, corrida_id, periodo).to_sql(
+            'indicador_por_factura', conexion, if_exists='append', index=False
+        )
+        _preparar_para_almacen(reporte_detallado, COLUMNAS_DETALLE, corrida_id, periodo).to_sql(
+            'detalle_reporte', conexion, if_exists='append', index=False
+        )
+    conexion.close()
+
+    return corrida_id
+
+
+def determinar_periodo(reporte_detallado: pd.DataFrame) -> str:
+    """
+    Determina el periodo de una corrida como el mes con más líneas cobradas en el detalle.
+
+    Un extracto de cierre suele incluir algunos cobros de los primeros días del mes
+    siguiente, por lo que el mes de la última fecha no representa a la corrida.
+
+    Returns:
+        str: Periodo en formato 'AAAA-MM'
+    """
+    meses = pd.to_datetime(reporte_detallado['Fecha']).dt.strftime('%Y-%m')
+    # Ante un empate se toma el mes más reciente
+    return meses.value_counts().sort_index().iloc[::-1].idxmax()
+
+
+def consultar_historial(ruta: str = RUTA_ALMACEN_POR_DEFECTO, clientes: Optional[List[str]] = None,
+                        desde: Optional[str] = None, hasta: Optional[str] = None) -> pd.DataFrame:
+    """
+    Consulta el indicador por factura guardado, filtrando por clientes y periodos.
+
+    Args:
+        ruta: Ruta del archivo SQLite
+        clientes: Lista de valores de 'Nombre' a incluir (todos si es None)
+        desde: Primer periodo a incluir ('AAAA-MM')
+        hasta: Último periodo a incluir ('AAAA-MM')
+
+    Returns:
+        pd.DataFrame: Filas del indicador por factura con su periodo y corrida
+    """
+    condiciones, parametros = [], []
+    if clientes:
+        condiciones.append(f'"Nombre" IN ({", ".join("?" for _ in clientes)})')
+        parametros.extend(clientes)
+    if desde:
+        condiciones.append('periodo >= ?')
+        parametros.append(desde)
+    if hasta:
+        condiciones.append('periodo <= ?')
+        parametros.append(hasta)
+
+    consulta = 'SELECT * FROM indicador_por_factura'
+    if condiciones:
+        consulta += ' WHERE ' + ' AND '.join(condiciones)
+
+    with conectar_almacen(ruta) as conexion:
+        historial = pd.read_sql_query(consulta, conexion, params=parametros)
+    conexion.close()
+
+    return historial
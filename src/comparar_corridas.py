@@ -0,0 +1,153 @@
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Hoja del Excel de salida con el indicador por factura y columna que alinea las corridas
+HOJA_INDICADOR = 'Indicador por Factura'
+COLUMNA_CLAVE = 'nro_factura'
+COLUMNA_DIAS = 'cantidad_de_dias_en_calle'
+
+# Columnas de texto del indicador: al leer desde Excel se fuerzan a texto para que
+# '00084643' no se convierta en 84643 y difiera de la misma corrida leída desde Parquet
+COLUMNAS_TEXTO = ['Nombre', 'nro_recibo', 'Asiento', 'nro_factura', 'Referencia']
+
+
+def ruta_columnar(ruta_salida: str) -> str:
+    """Devuelve la ruta del Parquet que acompaña a un Excel de salida."""
+    return os.path.splitext(ruta_salida)[0] + '.parquet'
+
+
+def guardar_columnar(resultado: pd.DataFrame, ruta_salida: str) -> str:
+    """
+    Guarda el indicador por factura en Parquet junto al Excel de salida.
+
+    Returns:
+        str: Ruta del Parquet escrito
+    """
+    ruta = ruta_columnar(ruta_salida)
+    resultado.to_parquet(ruta, index=False)
+    return ruta
+
+
+def leer_corrida(ruta: str) -> pd.DataFrame:
+    """
+    Lee el indicador por factura de una corrida.
+
+    Acepta el Parquet de la corrida o su Excel de salida. Si el Excel tiene un Parquet
+    al día a su lado se lee ese; si no, se lee la hoja del Excel una única vez y se deja
+    el Parquet para las próximas comparaciones.
+    """
+    if ruta.lower().endswith('.parquet'):
+        return pd.read_parquet(ruta)
+
+    cache = ruta_columnar(ruta)
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(ruta):
+        return pd.read_parquet(cache)
+
+    columnas = pd.read_excel(ruta, sheet_name=HOJA_INDICADOR, nrows=0).columns
+    resultado = pd.read_excel(
+        ruta, sheet_name=HOJA_INDICADOR,
+        dtype={columna: str for columna in COLUMNAS_TEXTO if columna in columnas}
+    )
+    guardar_columnar(resultado, ruta)
+    return resultado
+
+
+def _normalizar(resultado: pd.DataFrame, columnas: List[str], decimales: int) -> pd.DataFrame:
+    """Deja las columnas comparadas en una forma estable: texto sin categorías y números redondeados."""
+    normalizado = {}
+    for columna in [COLUMNA_CLAVE] + columnas:
+        serie = resultado[columna]
+        if pd.api.types.is_numeric_dtype(serie) and not isinstance(serie.dtype, pd.CategoricalDtype):
+            normalizado[columna] = serie.astype(float).round(decimales)
+        else:
+            normalizado[columna] = serie.astype(str).where(serie.notna(), None)
+    normalizado = pd.DataFrame(normalizado)
+
+    # Las facturas repetidas se alinean por orden de aparición
+    normalizado['ocurrencia'] = normalizado.groupby(COLUMNA_CLAVE, sort=False, dropna=False).cumcount()
+    return normalizado
+
+
+def huellas(resultado: pd.DataFrame, columnas: List[str]) -> pd.Series:
+    """Calcula un hash de 64 bits por fila sobre las columnas indicadas."""
+    return pd.util.hash_pandas_object(resultado[columnas], index=False)
+
+
+def comparar_corridas(anterior: pd.DataFrame, actual: pd.DataFrame,
+                      columnas: Optional[List[str]] = None, decimales: int = 2) -> Dict[str, pd.DataFrame]:
+    """
+    Compara dos corridas del indicador alineándolas por número de factura.
+
+    Cada fila se resume en una huella y sólo se comparan columna a columna las filas
+    cuyas huellas difieren, por lo que el costo es lineal en el tamaño del reporte.
+
+    Args:
+        anterior: Indicador por factura de la corrida anterior
+        actual: Indicador por factura de la corrida actual
+        columnas: Columnas a comparar; por defecto todas las comunes a ambas corridas
+        decimales: Decimales a los que se redondean los importes antes de comparar
+
+    Returns:
+        Dict[str, pd.DataFrame]: Facturas 'agregadas', 'eliminadas' y 'modificadas'
+    """
+    if columnas is None:
+        columnas = [columna for columna in anterior.columns if columna in actual.columns and columna != COLUMNA_CLAVE]
+
+    anterior = _normalizar(anterior, columnas, decimales)
+    actual = _normalizar(actual, columnas, decimales)
+    anterior['huella'] = huellas(anterior, columnas)
+    actual['huella'] = huellas(actual, columnas)
+
+    claves = [COLUMNA_CLAVE, 'ocurrencia']
+    alineado = anterior[claves + ['huella']].merge(
+        actual[claves + ['huella']], on=claves, how='outer',
+        suffixes=('_anterior', '_actual'), indicator=True
+    )
+
+    agregadas = alineado.loc[alineado['_merge'] == 'right_only', claves].merge(actual, on=claves)
+    eliminadas = alineado.loc[alineado['_merge'] == 'left_only', claves].merge(anterior, on=claves)
+
+    distintas = alineado.loc[
+        (alineado['_merge'] == 'both') & (alineado['huella_anterior'] != alineado['huella_actual']), claves
+    ]
+    antes = distintas.merge(anterior, on=claves)
+    despues = distintas.merge(actual, on=claves)
+
+    # Sólo las filas con huellas distintas se comparan columna a columna
+    cambios = pd.DataFrame({
+        columna: ~((antes[columna] == despues[columna]) | (antes[columna].isna() & despues[columna].isna()))
+        for columna in columnas
+    })
+    modificadas = antes[claves].assign(
+        columnas_modificadas=[
+            ', '.join(np.array(columnas)[fila]) for fila in cambios.to_numpy(dtype=bool)
+        ] if len(cambios) else []
+    )
+    if COLUMNA_DIAS in columnas:
+        modificadas[f'{COLUMNA_DIAS}_anterior'] = antes[COLUMNA_DIAS]
+        modificadas[f'{COLUMNA_DIAS}_actual'] = despues[COLUMNA_DIAS]
+        modificadas[f'delta_{COLUMNA_DIAS}'] = despues[COLUMNA_DIAS] - antes[COLUMNA_DIAS]
+    if 'Nombre' in columnas:
+        modificadas.insert(0, 'Nombre', despues['Nombre'])
+
+    return {
+        'agregadas': agregadas.drop(columns=['ocurrencia', 'huella']),
+        'eliminadas': eliminadas.drop(columns=['ocurrencia', 'huella']),
+        'modificadas': modificadas.drop(columns=['ocurrencia']),
+    }
+
+
+def resumen_comparacion(diferencias: Dict[str, pd.DataFrame]) -> pd.Series:
+    """Devuelve la cantidad de facturas agregadas, eliminadas y modificadas."""
+    return pd.Series({tipo: len(df) for tipo, df in diferencias.items()}, name='facturas')
+
+
+def guardar_comparacion(diferencias: Dict[str, pd.DataFrame], ruta_salida: str) -> None:
+    """Guarda cada tipo de diferencia en una hoja de Excel."""
+    with pd.ExcelWriter(ruta_salida) as writer:
+        resumen_comparacion(diferencias).to_frame().to_excel(writer, sheet_name='Resumen')
+        for tipo, df in diferencias.items():
+            df.to_excel(writer, sheet_name=tipo.capitalize(), index=False)
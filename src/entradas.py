@@ -0,0 +1,77 @@
+import glob
+import os
+from typing import Dict, Optional
+
+# Este módulo no importa pandas para que la CLI pueda listar y validar entradas sin demoras.
+# 'columnas' son las columnas que usan las etapas del proceso y se verifican antes de leer los datos.
+
+RUTA_SALIDA_POR_DEFECTO = './data/reporte_dias_en_calle.xlsx'
+DIRECTORIO_POR_CLIENTE_POR_DEFECTO = './data/por_cliente'
+
+ARCHIVOS_ENTRADA = {
+    'cobranza_recibo': {
+        'descripcion': 'Cobranza por Recibo',
+        'ruta': './data/para_pruebas/v1/cobranza por recibo.xlsx',
+        'skiprows': 0,
+        'columnas': ['Recibo', 'Nombre', 'Interno', 'Pago'],
+    },
+    'cobranza_factura': {
+        'descripcion': 'Cobranza por Factura',
+        'ruta': './data/para_pruebas/v1/cobranza por factura.xlsx',
+        'skiprows': 0,
+        'columnas': ['Comprobante', 'Factura', 'FechaFactura'],
+    },
+    'deudores_ventas': {
+        'descripcion': 'Deudores por Ventas',
+        'ruta': './data/para_pruebas/v1/mayor de ds x vtas.xlsx',
+        'skiprows': 0,
+        'columnas': ['Compr.Rel.', 'Asiento'],
+    },
+    'mayor_ppi': {
+        'descripcion': 'Mayor de PPIs',
+        'ruta': './data/para_pruebas/v1/cobros totales.xlsx',
+        'skiprows': 0,
+        'columnas': ['Asiento', 'Nombre cuenta', 'Referencia', 'Fecha', 'Haber'],
+    },
+    'detalle_de_recibos': {
+        'descripcion': 'Detalle de Recibos',
+        'ruta': './data/para_pruebas/Analisis financiero de cobranza por detalle de recibo.xlsx',
+        'skiprows': 0,
+        'columnas': ['Recibo', 'Comprobante', 'Fecha Comp.', 'Fecha del Valor', 'Pago'],
+    },
+}
+
+
+def resolver_ruta(patron: str) -> str:
+    """
+    Resuelve una ruta o patrón glob a un único archivo.
+
+    Si el patrón coincide con varios archivos se usa el modificado más recientemente.
+
+    Raises:
+        FileNotFoundError: Si ningún archivo coincide con el patrón
+    """
+    if os.path.isfile(patron):
+        return patron
+
+    coincidencias = [ruta for ruta in glob.glob(patron) if os.path.isfile(ruta)]
+    if not coincidencias:
+        raise FileNotFoundError(f"No se encontró ningún archivo para '{patron}'")
+    return max(coincidencias, key=os.path.getmtime)
+
+
+def resolver_rutas(rutas: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Combina las rutas indicadas con las rutas por defecto y resuelve los patrones glob.
+
+    Args:
+        rutas: Ruta o patrón por clave de ARCHIVOS_ENTRADA; las claves ausentes usan la ruta por defecto
+
+    Returns:
+        Dict[str, str]: Ruta de archivo resuelta para cada entrada
+    """
+    rutas = {clave: valor for clave, valor in (rutas or {}).items() if valor}
+    return {
+        clave: resolver_ruta(rutas.get(clave, archivo['ruta']))
+        for clave, archivo in ARCHIVOS_ENTRADA.items()
+    }
@@ -0,0 +1,303 @@
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from src.almacen_historico import RUTA_ALMACEN_POR_DEFECTO, conectar_almacen
+
+VENTANAS_POR_DEFECTO = (30, 90, 365)
+
+LIMITES_ANTIGUEDAD = [float('-inf'), 0, 30, 60, 90, 180, float('inf')]
+TRAMOS_ANTIGUEDAD = ['0 o menos', '1-30', '31-60', '61-90', '91-180', 'Más de 180']
+
+TABLAS_METRICAS = ('metricas_diarias', 'metricas_antiguedad', 'metricas_cohortes')
+
+# Cada tabla guarda agregados aditivos por fecha de cobro. Un extracto reemplaza todas las
+# filas del rango de fechas de cobro que cubre, de modo que dos extractos que se superponen
+# (por ejemplo, cobros de enero que vuelven a aparecer en el cierre de febrero) no se suman
+# dos veces y nunca hace falta recalcular el histórico. 'periodo' indica qué corrida escribió la fila.
+_ESQUEMA_METRICAS = """
+CREATE TABLE IF NOT EXISTS metricas_diarias (
+    periodo TEXT NOT NULL,
+    "Nombre" TEXT NOT NULL,
+    fecha_cobro TEXT NOT NULL,
+    importe_por_dias REAL NOT NULL,
+    "Haber" REAL NOT NULL,
+    cantidad_lineas INTEGER NOT NULL,
+    PRIMARY KEY ("Nombre", fecha_cobro)
+);
+
+CREATE TABLE IF NOT EXISTS metricas_antiguedad (
+    periodo TEXT NOT NULL,
+    "Nombre" TEXT NOT NULL,
+    fecha_cobro TEXT NOT NULL,
+    tramo TEXT NOT NULL,
+    "Haber" REAL NOT NULL,
+    cantidad_lineas INTEGER NOT NULL,
+    PRIMARY KEY ("Nombre", fecha_cobro, tramo)
+);
+
+CREATE TABLE IF NOT EXISTS metricas_cohortes (
+    periodo TEXT NOT NULL,
+    "Nombre" TEXT NOT NULL,
+    fecha_cobro TEXT NOT NULL,
+    mes_factura TEXT NOT NULL,
+    importe_por_dias REAL NOT NULL,
+    "Haber" REAL NOT NULL,
+    cantidad_lineas INTEGER NOT NULL,
+    PRIMARY KEY ("Nombre", fecha_cobro, mes_factura)
+);
+
+CREATE INDEX IF NOT EXISTS ix_metricas_diarias_fecha ON metricas_diarias(fecha_cobro);
+CREATE INDEX IF NOT EXISTS ix_metricas_antiguedad_fecha ON metricas_antiguedad(fecha_cobro);
+CREATE INDEX IF NOT EXISTS ix_metricas_cohortes_fecha ON metricas_cohortes(fecha_cobro);
+"""
+
+
+def _conectar_metricas(ruta: str):
+    """Abre el almacén histórico asegurando que existan las tablas de métricas."""
+    conexion = conectar_almacen(ruta)
+    conexion.executescript(_ESQUEMA_METRICAS)
+    return conexion
+
+
+def calcular_deltas(reporte_detallado: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Calcula los agregados aditivos por fecha de cobro que aporta el detalle de una corrida.
+
+    Args:
+        reporte_detallado: DataFrame 'Detalle del Reporte' con las columnas
+            Nombre, Fecha, FechaFactura, Haber, cantidad_de_dias_para_cobrar e importe_por_dias
+
+    Returns:
+        Dict[str, pd.DataFrame]: Agregados diarios, por tramo de antigüedad y por cohorte de facturación
+    """
+    print("Calculando deltas de métricas...")
+
+    detalle = reporte_detallado[
+        ['Nombre', 'Fecha', 'FechaFactura', 'Haber', 'cantidad_de_dias_para_cobrar', 'importe_por_dias']
+    ].dropna(subset=['Nombre', 'Fecha', 'Haber', 'cantidad_de_dias_para_cobrar'])
+
+    detalle = detalle.assign(
+        Nombre=detalle['Nombre'].astype(str),
+        fecha_cobro=pd.to_datetime(detalle['Fecha']).dt.strftime('%Y-%m-%d'),
+        mes_factura=pd.to_datetime(detalle['FechaFactura']).dt.strftime('%Y-%m'),
+        tramo=pd.cut(
+            detalle['cantidad_de_dias_para_cobrar'],
+            bins=LIMITES_ANTIGUEDAD,
+            labels=TRAMOS_ANTIGUEDAD
+        ).astype(str)
+    )
+
+    diarias = detalle.groupby(['Nombre', 'fecha_cobro'], as_index=False).agg(
+        importe_por_dias=('importe_por_dias', 'sum'),
+        Haber=('Haber', 'sum'),
+        cantidad_lineas=('Haber', 'size')
+    )
+
+    antiguedad = detalle.groupby(['Nombre', 'fecha_cobro', 'tramo'], as_index=False).agg(
+        Haber=('Haber', 'sum'),
+        cantidad_lineas=('Haber', 'size')
+    )
+
+    cohortes = detalle.dropna(subset=['mes_factura']).groupby(
+        ['Nombre', 'fecha_cobro', 'mes_factura'], as_index=False
+    ).agg(
+        importe_por_dias=('importe_por_dias', 'sum'),
+        Haber=('Haber', 'sum'),
+        cantidad_lineas=('Haber', 'size')
+    )
+
+    return {
+        'metricas_diarias': diarias,
+        'metricas_antiguedad': antiguedad,
+        'metricas_cohortes': cohortes
+    }
+
+
+def aplicar_deltas(deltas: Dict[str, pd.DataFrame], periodo: str,
+                   ruta: str = RUTA_ALMACEN_POR_DEFECTO) -> None:
+    """
+    Incorpora los agregados de una corrida al almacén.
+
+    Las filas ya guardadas dentro del rango de fechas de cobro que cubre la corrida se
+    reemplazan: para esas fechas el extracto más reciente es el que vale.
+
+    Args:
+        deltas: Agregados devueltos por calcular_deltas
+        periodo: Periodo de la corrida en formato 'AAAA-MM'
+        ruta: Ruta del archivo SQLite
+    """
+    print(f"Actualizando métricas del periodo {periodo}...")
+
+    fechas = deltas['metricas_diarias']['fecha_cobro']
+
+    with _conectar_metricas(ruta) as conexion:
+        if len(fechas):
+            desde, hasta = fechas.min(), fechas.max()
+            for tabla in TABLAS_METRICAS:
+                conexion.execute(f'DELETE FROM {tabla} WHERE fecha_cobro BETWEEN ? AND ?', (desde, hasta))
+
+        for tabla, delta in deltas.items():
+            delta.assign(periodo=periodo).to_sql(tabla, conexion, if_exists='append', index=False)
+    conexion.close()
+
+
+def ventanas_moviles(fecha_corte: Optional[str] = None, ventanas: Iterable[int] = VENTANAS_POR_DEFECTO,
+                     por_cliente: bool = False, ruta: str = RUTA_ALMACEN_POR_DEFECTO) -> pd.DataFrame:
+    """
+    Calcula los días en calle ponderados por importe en ventanas móviles que terminan en la fecha de corte.
+
+    Args:
+        fecha_corte: Última fecha de cobro incluida ('AAAA-MM-DD'); por defecto la última disponible
+        ventanas: Largos de ventana en días
+        por_cliente: Si es True agrupa además por 'Nombre'
+        ruta: Ruta del archivo SQLite
+
+    Returns:
+        pd.DataFrame: Columnas ventana, [Nombre,] Haber, importe_por_dias y dias_en_calle_ponderados
+    """
+    agrupacion = ', "Nombre"' if por_cliente else ''
+    resultados = []
+
+    with _conectar_metricas(ruta) as conexion:
+        if fecha_corte is None:
+            fecha_corte = conexion.execute('SELECT MAX(fecha_cobro) FROM metricas_diarias').fetchone()[0]
+
+        # En un almacén sin métricas todavía no hay fecha de corte ni ventanas que calcular
+        for ventana in (ventanas if fecha_corte is not None else ()):
+            desde = (pd.Timestamp(fecha_corte) - pd.Timedelta(days=ventana)).strftime('%Y-%m-%d')
+            consulta = f"""
+                SELECT {ventana} AS ventana{agrupacion},
+                       SUM("Haber") AS "Haber",
+                       SUM(importe_por_dias) AS importe_por_dias
+                FROM metricas_diarias
+                WHERE fecha_cobro > ? AND fecha_cobro <= ?
+            """
+            if por_cliente:
+                consulta += ' GROUP BY "Nombre"'
+            resultados.append(pd.read_sql_query(consulta, conexion, params=(desde, fecha_corte)))
+    conexion.close()
+
+    if not resultados:
+        columnas = ['ventana'] + (['Nombre'] if por_cliente else [])
+        return pd.DataFrame(columns=columnas + ['Haber', 'importe_por_dias', 'dias_en_calle_ponderados'])
+
+    metricas = pd.concat(resultados, ignore_index=True)
+    metricas['dias_en_calle_ponderados'] = metricas['importe_por_dias'] / metricas['Haber']
+    return metricas
+
+
+def antiguedad_por_cliente(ruta: str = RUTA_ALMACEN_POR_DEFECTO) -> pd.DataFrame:
+    """
+    Resume el importe cobrado por tramo de días para cobrar y cliente.
+
+    Returns:
+        pd.DataFrame: Una fila por cliente y una columna por tramo de antigüedad
+    """
+    with _conectar_metricas(ruta) as conexion:
+        antiguedad = pd.read_sql_query(
+            'SELECT "Nombre", tramo, SUM("Haber") AS "Haber" FROM metricas_antiguedad GROUP BY "Nombre", tramo',
+            conexion
+        )
+    conexion.close()
+
+    return antiguedad.pivot_table(
+        index='Nombre', columns='tramo', values='Haber', fill_value=0
+    ).reindex(columns=TRAMOS_ANTIGUEDAD, fill_value=0).reset_index()
+
+
+def cohortes_por_mes_factura(por_cliente: bool = False, ruta: str = RUTA_ALMACEN_POR_DEFECTO) -> pd.DataFrame:
+    """
+    Calcula los días en calle ponderados según el mes de emisión de la factura.
+
+    Returns:
+        pd.DataFrame: Columnas mes_factura, [Nombre,] Haber, cantidad_lineas y dias_en_calle_ponderados
+    """
+    agrupacion = 'mes_factura, "Nombre"' if por_cliente else 'mes_factura'
+
+    with _conectar_metricas(ruta) as conexion:
+        cohortes = pd.read_sql_query(
+            f"""
+            SELECT {agrupacion},
+                   SUM("Haber") AS "Haber",
+                   SUM(importe_por_dias) AS importe_por_dias,
+                   SUM(cantidad_lineas) AS cantidad_lineas
+            FROM metricas_cohortes
+            GROUP BY {agrupacion}
+            ORDER BY {agrupacion}
+            """,
+            conexion
+        )
+    conexion.close()
+
+    cohortes['dias_en_calle_ponderados'] = cohortes['importe_por_dias'] / cohortes['Haber']
+    return cohortes.drop(columns='importe_por_dias')
+
+
+def tendencia_por_cliente(ruta: str = RUTA_ALMACEN_POR_DEFECTO,
+                          clientes: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Calcula los días en calle ponderados por importe para cada cliente y mes de cobro.
+
+    Returns:
+        pd.DataFrame: Columnas periodo, Nombre, cantidad_lineas, Haber y dias_en_calle_ponderados
+    """
+    consulta = """
+        SELECT substr(fecha_cobro, 1, 7) AS periodo,
+               "Nombre",
+               SUM(cantidad_lineas) AS cantidad_lineas,
+               SUM("Haber") AS "Haber",
+               SUM(importe_por_dias) / SUM("Haber") AS dias_en_calle_ponderados
+        FROM metricas_diarias
+    """
+    parametros: List[str] = []
+    if clientes:
+        consulta += f' WHERE "Nombre" IN ({", ".join("?" for _ in clientes)})'
+        parametros.extend(clientes)
+    # Se agrupa por la expresión: 'periodo' también es una columna de la tabla (la corrida que escribió la fila)
+    consulta += ' GROUP BY substr(fecha_cobro, 1, 7), "Nombre" ORDER BY "Nombre", 1'
+
+    with _conectar_metricas(ruta) as conexion:
+        tendencia = pd.read_sql_query(consulta, conexion, params=parametros)
+    conexion.close()
+
+    return tendencia
+
+
+def tendencia_movil(ruta: str = RUTA_ALMACEN_POR_DEFECTO, ventana: int = 3) -> pd.DataFrame:
+    """
+    Calcula los días en calle ponderados de toda la empresa por mes de cobro y su promedio móvil.
+
+    Args:
+        ruta: Ruta del archivo SQLite
+        ventana: Cantidad de meses del promedio móvil
+
+    Returns:
+        pd.DataFrame: Columnas periodo, Haber, dias_en_calle_ponderados y dias_en_calle_movil
+    """
+    consulta = """
+        SELECT substr(fecha_cobro, 1, 7) AS periodo,
+               SUM("Haber") AS "Haber",
+               SUM(importe_por_dias) AS importe_por_dias
+        FROM metricas_diarias
+        GROUP BY substr(fecha_cobro, 1, 7)
+        ORDER BY 1
+    """
+    with _conectar_metricas(ruta) as conexion:
+        tendencia = pd.read_sql_query(consulta, conexion)
+    conexion.close()
+
+    # Con todos los meses presentes, la ventana nunca abarca más de 'ventana' meses
+    if len(tendencia):
+        meses = pd.period_range(tendencia['periodo'].iloc[0], tendencia['periodo'].iloc[-1], freq='M')
+        tendencia = tendencia.set_index('periodo').reindex(meses.strftime('%Y-%m'), fill_value=0.0)
+        tendencia = tendencia.rename_axis('periodo').reset_index()
+
+    tendencia['dias_en_calle_ponderados'] = tendencia['importe_por_dias'] / tendencia['Haber'].where(tendencia['Haber'] != 0)
+
+    # El promedio móvil también se pondera por importe, no por mes
+    suma_importe_por_dias = tendencia['importe_por_dias'].rolling(ventana, min_periods=1).sum()
+    suma_haber = tendencia['Haber'].rolling(ventana, min_periods=1).sum()
+    tendencia['dias_en_calle_movil'] = suma_importe_por_dias / suma_haber.where(suma_haber != 0)
+
+    return tendencia[['periodo', 'Haber', 'dias_en_calle_ponderados', 'dias_en_calle_movil']]
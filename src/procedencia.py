@@ -0,0 +1,109 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.entradas import ARCHIVOS_ENTRADA
+
+# Cada fila del detalle lleva un código entero de 4 bytes con su procedencia:
+#   bits  0-19  fila del DataFrame de entrada (un Excel tiene como máximo 2**20 filas)
+#   bits 20-23  archivo de entrada (0 = sin archivo de origen)
+#   bits 24-27  nivel de coincidencia con el que se obtuvo la fila
+COLUMNA_PROCEDENCIA = 'procedencia'
+
+BITS_FILA = 20
+BITS_ARCHIVO = 4
+MAXIMO_FILAS = 2 ** BITS_FILA
+
+CODIGOS_ARCHIVO = {clave: codigo for codigo, clave in enumerate(ARCHIVOS_ENTRADA, start=1)}
+
+NIVELES_COINCIDENCIA = {
+    0: 'entrada',
+    1: 'referencia_ppi',              # cobranza -> deudores -> cobranza por factura -> mayor de PPIs
+    2: 'detalle_por_factura',         # asiento no encontrado, resuelto en el detalle de recibos por factura
+    3: 'detalle_por_recibo_interno',  # factura no encontrada, resuelta en el detalle de recibos por recibo
+}
+CODIGOS_NIVEL = {nombre: codigo for codigo, nombre in NIVELES_COINCIDENCIA.items()}
+
+
+def agregar_procedencia(df: pd.DataFrame, clave: str) -> pd.DataFrame:
+    """
+    Agrega a un DataFrame de entrada el código de procedencia de cada fila.
+
+    Se usa la etiqueta del índice, que tras read_excel es la posición de la fila
+    en el archivo y se conserva aunque luego se descarten filas.
+    """
+    filas = df.index.to_numpy()
+    if len(filas) and (filas.min() < 0 or filas.max() >= MAXIMO_FILAS):
+        raise ValueError(f"{clave}: el índice no corresponde a filas de un Excel de entrada")
+
+    codigos = (CODIGOS_ARCHIVO[clave] << BITS_FILA) | filas.astype(np.int32)
+    return df.assign(**{COLUMNA_PROCEDENCIA: codigos.astype(np.int32)})
+
+
+def columnas_con_procedencia(df: pd.DataFrame, columnas: List[str]) -> List[str]:
+    """Agrega la columna de procedencia a una selección de columnas si el DataFrame la tiene."""
+    return columnas + [COLUMNA_PROCEDENCIA] if COLUMNA_PROCEDENCIA in df.columns else columnas
+
+
+def marcar_nivel(df: pd.DataFrame, nivel: str) -> pd.DataFrame:
+    """
+    Registra en la procedencia el nivel de coincidencia con el que se obtuvieron las filas.
+
+    Las filas sin archivo de origen (por ejemplo, sin coincidencia en un merge) quedan
+    sólo con el nivel. Si el DataFrame no tiene procedencia se devuelve sin cambios.
+    """
+    if COLUMNA_PROCEDENCIA not in df.columns:
+        return df
+
+    origen = df[COLUMNA_PROCEDENCIA].fillna(0).to_numpy(dtype=np.int32)
+    codigos = origen | np.int32(CODIGOS_NIVEL[nivel] << (BITS_FILA + BITS_ARCHIVO))
+    return df.assign(**{COLUMNA_PROCEDENCIA: codigos})
+
+
+def expandir_procedencia(codigos) -> pd.DataFrame:
+    """
+    Expande códigos de procedencia a archivo, fila y nivel de coincidencia.
+
+    Args:
+        codigos: Códigos de procedencia (Series, array o lista)
+
+    Returns:
+        pd.DataFrame: Una fila por código con archivo, descripción, fila del DataFrame,
+            fila en el Excel y nivel de coincidencia
+    """
+    codigos = np.asarray(codigos, dtype=np.int64)
+    filas = codigos & (MAXIMO_FILAS - 1)
+    archivos = (codigos >> BITS_FILA) & (2 ** BITS_ARCHIVO - 1)
+    niveles = codigos >> (BITS_FILA + BITS_ARCHIVO)
+
+    claves = np.array([None] + list(ARCHIVOS_ENTRADA), dtype=object)
+    descripciones = np.array([None] + [archivo['descripcion'] for archivo in ARCHIVOS_ENTRADA.values()], dtype=object)
+    # Fila en el Excel: encabezado y filas salteadas, contando desde 1
+    desplazamientos = np.array([0] + [archivo['skiprows'] + 2 for archivo in ARCHIVOS_ENTRADA.values()])
+
+    return pd.DataFrame({
+        COLUMNA_PROCEDENCIA: codigos,
+        'archivo': claves[archivos],
+        'descripcion': descripciones[archivos],
+        'fila': np.where(archivos > 0, filas, -1),
+        'fila_excel': np.where(archivos > 0, filas + desplazamientos[archivos], -1),
+        'nivel': pd.Series(niveles).map(NIVELES_COINCIDENCIA).to_numpy(),
+    })
+
+
+def procedencia_de_factura(reporte_detallado: pd.DataFrame, nro_factura: str) -> pd.DataFrame:
+    """
+    Devuelve las filas del detalle de una factura junto con la procedencia expandida de cada una.
+
+    Sirve para revisar una factura a partir del detalle guardado, sin volver a ejecutar el proceso.
+    """
+    filas = reporte_detallado[reporte_detallado['nro_factura'] == nro_factura]
+    procedencia = expandir_procedencia(filas[COLUMNA_PROCEDENCIA]).drop(columns=COLUMNA_PROCEDENCIA)
+    return pd.concat([filas.reset_index(drop=True), procedencia], axis=1)
+
+
+def resumen_procedencia(reporte_detallado: pd.DataFrame) -> Dict[str, int]:
+    """Cuenta las filas del detalle por nivel de coincidencia."""
+    niveles = reporte_detallado[COLUMNA_PROCEDENCIA].to_numpy(dtype=np.int64) >> (BITS_FILA + BITS_ARCHIVO)
+    return pd.Series(niveles).map(NIVELES_COINCIDENCIA).value_counts().to_dict()
@@ -1,9 +1,11 @@
 import pandas as pd
+from utils.data_utils import particionar
+from src.procedencia import columnas_con_procedencia
 
 def procesar_asientos_no_encontrados(asientos_no_encontrados, detalle_de_recibos):
     # Realizar el merge entre ambas tablas usando 'nro_factura' y 'Comprobante' como claves
     df_merged = asientos_no_encontrados.merge(
-        detalle_de_recibos[['nro_factura', 'Fecha del Valor', 'Pago']],
+        detalle_de_recibos[columnas_con_procedencia(detalle_de_recibos, ['nro_factura', 'Fecha del Valor', 'Pago'])],
         on="nro_factura",
         how="left"
     )
@@ -24,11 +26,9 @@ def procesar_asientos_no_encontrados(asientos_no_encontrados, detalle_de_recibos
     resultado_final = resultado_final.rename(columns={"Pago_y": "Haber"})
     resultado_final = resultado_final.rename(columns={"Pago_x": "Pago"})
 
-    # Filtrar los registros que NO tienen un valor en 'Haber' (no se encontraron)
-    df_asientos_no_encontrados = resultado_final[resultado_final["Haber"].isna()]
-
-    # Filtrar los registros que sí tienen un valor en 'Haber' (se encontraron en detalle_de_recibos)
-    resultado_final = resultado_final.dropna(subset=["Haber"])
+    # Separar los registros que sí tienen un valor en 'Haber' (se encontraron en detalle_de_recibos)
+    # de los que no (no se encontraron)
+    resultado_final, df_asientos_no_encontrados = particionar(resultado_final, resultado_final["Haber"].notna())
 
     # Opcional: Resetear los índices
     resultado_final = resultado_final.reset_index(drop=True)
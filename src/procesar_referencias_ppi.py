@@ -1,5 +1,7 @@
 import pandas as pd
 from typing import Tuple
+from utils.data_utils import particionar
+from src.procedencia import columnas_con_procedencia
 
 def procesar_referencias_ppi(reporte: pd.DataFrame, df_mayor_ppi: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
@@ -18,13 +20,15 @@ def procesar_referencias_ppi(reporte: pd.DataFrame, df_mayor_ppi: pd.DataFrame)
     )
     
     # Separar asientos no encontrados
-    asientos_no_encontrados = reporte[reporte['Referencia'].isna()]
-    reporte = reporte[reporte['Referencia'].notna()]
+    reporte, asientos_no_encontrados = particionar(reporte, reporte['Referencia'].notna())
     
-    # Procesar referencias
+    # Procesar referencias: una sola máscara para referencia encontrada y Haber informado
     referencias = reporte['Referencia'].unique()
-    df_ppi_referencias = df_mayor_ppi[df_mayor_ppi['Referencia'].isin(referencias)]
-    df_haber = df_ppi_referencias[df_ppi_referencias['Haber'].notna()][['Referencia', 'Fecha', 'Haber']]
+    # Las filas del mayor aportan el importe, por lo que también su procedencia
+    df_haber = df_mayor_ppi.loc[
+        df_mayor_ppi['Referencia'].isin(referencias) & df_mayor_ppi['Haber'].notna(),
+        columnas_con_procedencia(df_mayor_ppi, ['Referencia', 'Fecha', 'Haber'])
+    ]
     
     # Merge final
     reporte = reporte.merge(
@@ -0,0 +1,136 @@
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from src.entradas import DIRECTORIO_POR_CLIENTE_POR_DEFECTO
+from utils.data_utils import decodificar_columnas
+
+NOMBRE_INDICE = 'indice.xlsx'
+# Cliente con el que se guardan las filas sin 'Nombre', para que no queden fuera de los libros
+NOMBRE_SIN_CLIENTE = 'SIN CLIENTE'
+
+
+def nombre_archivo_cliente(nombre: str) -> str:
+    """
+    Devuelve un nombre de archivo válido y estable para el reporte de un cliente.
+
+    El sufijo con el hash del nombre evita que dos clientes que difieren sólo en
+    caracteres no permitidos terminen en el mismo archivo.
+    """
+    base = re.sub(r'[^\w\-. ]+', '', str(nombre)).strip().replace(' ', '_')[:60] or 'cliente'
+    return f"{base}-{hashlib.sha1(str(nombre).encode()).hexdigest()[:8]}.xlsx"
+
+
+def _completar_nombre(df: pd.DataFrame) -> pd.DataFrame:
+    """Asigna NOMBRE_SIN_CLIENTE a las filas sin 'Nombre', avisando cuántas son."""
+    faltantes = df['Nombre'].isna()
+    if not faltantes.any():
+        return df
+
+    print(f"{faltantes.sum()} filas sin cliente se guardan como '{NOMBRE_SIN_CLIENTE}'")
+    nombre = df['Nombre']
+    if isinstance(nombre.dtype, pd.CategoricalDtype) and NOMBRE_SIN_CLIENTE not in nombre.cat.categories:
+        nombre = nombre.cat.add_categories(NOMBRE_SIN_CLIENTE)
+    return df.assign(Nombre=nombre.fillna(NOMBRE_SIN_CLIENTE))
+
+
+def particionar_por_cliente(resultado: pd.DataFrame,
+                            reporte_detallado: pd.DataFrame) -> List[Tuple[str, pd.DataFrame, pd.DataFrame]]:
+    """
+    Separa el indicador y el detalle por cliente recorriendo cada DataFrame una sola vez.
+
+    Las filas sin 'Nombre' se agrupan bajo NOMBRE_SIN_CLIENTE.
+
+    Returns:
+        List[Tuple[str, pd.DataFrame, pd.DataFrame]]: Cliente, indicador y detalle de cada
+            cliente, de mayor a menor detalle
+    """
+    resultado = _completar_nombre(resultado)
+    reporte_detallado = _completar_nombre(reporte_detallado)
+
+    indicador_por_cliente = dict(tuple(resultado.groupby('Nombre', observed=True, sort=False)))
+    detalle_por_cliente = dict(tuple(reporte_detallado.groupby('Nombre', observed=True, sort=False)))
+
+    particiones = [
+        (nombre, indicador, detalle_por_cliente.get(nombre, reporte_detallado.iloc[:0]))
+        for nombre, indicador in indicador_por_cliente.items()
+    ]
+    # Los clientes más grandes primero, para que no queden rezagados al final del reparto
+    return sorted(particiones, key=lambda particion: len(particion[2]), reverse=True)
+
+
+def _escribir_cliente(tarea: Tuple[str, pd.DataFrame, pd.DataFrame]) -> str:
+    """Escribe el libro de un cliente; se ejecuta en un proceso de trabajo."""
+    ruta, indicador, detalle = tarea
+    with pd.ExcelWriter(ruta) as writer:
+        indicador.to_excel(writer, sheet_name='Indicador por Factura', index=False)
+        detalle.to_excel(writer, sheet_name='Detalle del Reporte', index=False)
+    return ruta
+
+
+def guardar_indice(indice: pd.DataFrame, directorio: str) -> str:
+    """Guarda el libro índice con un vínculo al archivo de cada cliente."""
+    ruta = os.path.join(directorio, NOMBRE_INDICE)
+    with pd.ExcelWriter(ruta, engine='openpyxl') as writer:
+        indice.to_excel(writer, sheet_name='Clientes', index=False)
+        hoja = writer.sheets['Clientes']
+        columna_archivo = indice.columns.get_loc('archivo') + 1
+        for fila, archivo in enumerate(indice['archivo'], start=2):
+            celda = hoja.cell(row=fila, column=columna_archivo)
+            celda.hyperlink = archivo
+            celda.style = 'Hyperlink'
+    return ruta
+
+
+def guardar_reportes_por_cliente(resultado: pd.DataFrame, reporte_detallado: pd.DataFrame,
+                                 directorio: str = DIRECTORIO_POR_CLIENTE_POR_DEFECTO,
+                                 procesos: Optional[int] = None) -> pd.DataFrame:
+    """
+    Guarda un libro por cliente, escritos en paralelo, y un libro índice que los vincula.
+
+    Args:
+        resultado: Indicador por factura
+        reporte_detallado: Detalle del reporte
+        directorio: Directorio donde se escriben los libros
+        procesos: Cantidad de procesos de trabajo; por defecto uno por núcleo, con 1 se escribe en serie
+
+    Returns:
+        pd.DataFrame: Índice con las métricas y el archivo de cada cliente
+    """
+    print("Guardando reportes por cliente...")
+
+    os.makedirs(directorio, exist_ok=True)
+    particiones = particionar_por_cliente(resultado, reporte_detallado)
+
+    # Se decodifica cada partición por separado: así cada tarea lleva sólo sus textos
+    # y no el diccionario completo de categorías al proceso de trabajo
+    tareas = [
+        (os.path.join(directorio, nombre_archivo_cliente(nombre)),
+         decodificar_columnas(indicador), decodificar_columnas(detalle))
+        for nombre, indicador, detalle in particiones
+    ]
+
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(tareas) <= 1:
+        rutas = [_escribir_cliente(tarea) for tarea in tareas]
+    else:
+        # Varios clientes por envío reducen el ida y vuelta con los procesos sin desbalancear el reparto
+        tamanio_lote = max(1, len(tareas) // (procesos * 4))
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            rutas = list(executor.map(_escribir_cliente, tareas, chunksize=tamanio_lote))
+
+    indice = pd.DataFrame({
+        'Nombre': [str(nombre) for nombre, _, _ in particiones],
+        'facturas': [len(indicador) for _, indicador, _ in particiones],
+        'filas_detalle': [len(detalle) for _, _, detalle in particiones],
+        'promedio_dias_en_calle': [indicador['cantidad_de_dias_en_calle'].mean() for _, indicador, _ in particiones],
+        'total_factura': [indicador['TotalFactura'].sum() for _, indicador, _ in particiones],
+        'archivo': [os.path.basename(ruta) for ruta in rutas],
+    }).sort_values('Nombre', ignore_index=True)
+
+    guardar_indice(indice, directorio)
+    return indice
@@ -0,0 +1,131 @@
+from typing import Dict, Optional
+
+import pandas as pd
+
+from src.procedencia import COLUMNA_PROCEDENCIA
+
+CONFIGURACION_POR_DEFECTO = {
+    # Diferencia admitida entre el Pago de un recibo y el total de Haber de sus líneas
+    'tolerancia_pago': 1.0,
+    # Cantidad máxima de filas de salida por fila de entrada entre dos etapas consecutivas
+    'ratio_expansion_maximo': 5.0,
+    'invariantes': (
+        'control_pago',
+        'dias_en_calle_negativos',
+        'dias_para_cobrar_negativos',
+        'expansion_de_filas',
+        'facturas_duplicadas',
+        'referencias_huerfanas',
+    ),
+}
+
+COLUMNAS_EXCEPCIONES = ['invariante', 'clave', 'valor', 'descripcion']
+
+
+def _excepciones(invariante: str, claves: pd.Series, valores: pd.Series, descripcion: str) -> pd.DataFrame:
+    """Arma el bloque de excepciones de un invariante con las filas que no lo cumplen."""
+    return pd.DataFrame({
+        'invariante': invariante,
+        'clave': claves.astype(object).to_numpy(),
+        'valor': valores.to_numpy(dtype=float),
+        'descripcion': descripcion,
+    })
+
+
+def validar_resultados(resultado: pd.DataFrame, reporte_detallado: pd.DataFrame,
+                       reporte_procesado: Optional[pd.DataFrame] = None,
+                       conteos_por_etapa: Optional[Dict[str, int]] = None,
+                       configuracion: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Verifica los invariantes del reporte final y de las etapas intermedias.
+
+    Args:
+        resultado: DataFrame 'Indicador por Factura'
+        reporte_detallado: DataFrame 'Detalle del Reporte', con la procedencia de cada línea
+        reporte_procesado: Salida de procesar_referencias_ppi, para detectar referencias sin Haber
+        conteos_por_etapa: Cantidad de filas de cada etapa, en el orden en que se ejecutaron
+        configuracion: Valores que reemplazan a los de CONFIGURACION_POR_DEFECTO
+
+    Returns:
+        pd.DataFrame: Una fila por excepción con las columnas invariante, clave, valor y descripcion
+    """
+    print("Validando resultados...")
+
+    configuracion = {**CONFIGURACION_POR_DEFECTO, **(configuracion or {})}
+    activos = set(configuracion['invariantes'])
+    bloques = []
+
+    if 'control_pago' in activos:
+        # Cada factura de un recibo repite todas las líneas de Haber de su cheque: se cuenta
+        # cada línea de origen una sola vez por recibo antes de compararla con el Pago
+        lineas = reporte_detallado.drop_duplicates(['nro_recibo', COLUMNA_PROCEDENCIA])
+        por_recibo = lineas.groupby('nro_recibo', observed=True).agg(Pago=('Pago', 'first'), Haber=('Haber', 'sum'))
+        diferencias = por_recibo['Pago'] - por_recibo['Haber']
+        fuera_de_tolerancia = diferencias[diferencias.abs() > configuracion['tolerancia_pago']]
+        bloques.append(_excepciones(
+            'control_pago',
+            fuera_de_tolerancia.index.to_series(),
+            fuera_de_tolerancia,
+            'Pago del recibo - Haber de sus líneas fuera de tolerancia'
+        ))
+
+    if 'dias_en_calle_negativos' in activos:
+        negativos = resultado['cantidad_de_dias_en_calle'] < 0
+        bloques.append(_excepciones(
+            'dias_en_calle_negativos',
+            resultado.loc[negativos, 'nro_factura'],
+            resultado.loc[negativos, 'cantidad_de_dias_en_calle'],
+            'Días en calle negativos para la factura'
+        ))
+
+    if 'dias_para_cobrar_negativos' in activos:
+        negativos = reporte_detallado['cantidad_de_dias_para_cobrar'] < 0
+        bloques.append(_excepciones(
+            'dias_para_cobrar_negativos',
+            reporte_detallado.loc[negativos, 'nro_factura'],
+            reporte_detallado.loc[negativos, 'cantidad_de_dias_para_cobrar'],
+            'Línea de detalle cobrada antes de la fecha de factura'
+        ))
+
+    if 'facturas_duplicadas' in activos:
+        duplicadas = resultado['nro_factura'].duplicated(keep=False)
+        conteo = resultado.loc[duplicadas].groupby('nro_factura', observed=True).size()
+        bloques.append(_excepciones(
+            'facturas_duplicadas',
+            conteo.index.to_series(),
+            conteo,
+            'Factura repetida en el indicador por factura'
+        ))
+
+    if 'referencias_huerfanas' in activos and reporte_procesado is not None:
+        huerfanas = reporte_procesado['Referencia'].notna() & reporte_procesado['Haber'].isna()
+        conteo = reporte_procesado.loc[huerfanas].groupby('Referencia', observed=True).size()
+        bloques.append(_excepciones(
+            'referencias_huerfanas',
+            conteo.index.to_series(),
+            conteo,
+            'Referencia sin líneas de Haber en el mayor de PPIs'
+        ))
+
+    if 'expansion_de_filas' in activos and conteos_por_etapa:
+        etapas = pd.Series(conteos_por_etapa, dtype=float)
+        ratios = etapas.to_numpy()[1:] / etapas.to_numpy()[:-1]
+        transiciones = pd.Series(etapas.index[:-1] + ' -> ' + etapas.index[1:])
+        excedidos = ratios > configuracion['ratio_expansion_maximo']
+        bloques.append(_excepciones(
+            'expansion_de_filas',
+            transiciones[excedidos],
+            pd.Series(ratios[excedidos]),
+            'Filas de salida por fila de entrada entre etapas'
+        ))
+
+    excepciones = pd.concat(
+        [bloque for bloque in bloques if len(bloque)] or [pd.DataFrame(columns=COLUMNAS_EXCEPCIONES)],
+        ignore_index=True
+    )
+
+    print(f"Cantidad de excepciones: {len(excepciones)}")
+    if len(excepciones):
+        print(excepciones['invariante'].value_counts().to_string())
+
+    return excepciones
@@ -0,0 +1,186 @@
+import os
+import re
+import zipfile
+from typing import Dict, List, Tuple
+from xml.etree.ElementTree import iterparse
+
+from src.entradas import ARCHIVOS_ENTRADA
+
+# Filas iniciales donde se busca el encabezado cuando no está en la fila esperada
+FILAS_A_INSPECCIONAR = 15
+
+_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_RELACIONES = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+
+class ErrorEntradaInvalida(ValueError):
+    """Una o más entradas no tienen la forma que esperan las etapas del proceso."""
+
+
+def _ruta_primera_hoja(libro: zipfile.ZipFile) -> Tuple[str, str]:
+    """Devuelve el nombre y la ruta dentro del zip de la primera hoja del libro."""
+    hoja = None
+    for _, elemento in iterparse(libro.open('xl/workbook.xml')):
+        if elemento.tag == f'{_NS}sheet':
+            hoja = elemento
+            break
+    if hoja is None:
+        raise KeyError('el libro no tiene hojas')
+    id_relacion = hoja.get(f'{_NS_RELACIONES}id')
+
+    for _, elemento in iterparse(libro.open('xl/_rels/workbook.xml.rels')):
+        if elemento.get('Id') == id_relacion:
+            destino = elemento.get('Target')
+            ruta = destino.lstrip('/') if destino.startswith('/') else f'xl/{destino}'
+            return hoja.get('name'), ruta
+
+    raise KeyError(f"no se encontró la hoja {hoja.get('name')}")
+
+
+def _indice_columna(referencia: str) -> int:
+    """Convierte la referencia de una celda (por ejemplo 'AB12') en el índice de su columna."""
+    indice = 0
+    for letra in re.match(r'[A-Z]+', referencia).group():
+        indice = indice * 26 + ord(letra) - ord('A') + 1
+    return indice - 1
+
+
+def _textos_compartidos(libro: zipfile.ZipFile, indices: set) -> Dict[int, str]:
+    """Lee de sharedStrings.xml sólo hasta el mayor índice pedido."""
+    if not indices or 'xl/sharedStrings.xml' not in libro.namelist():
+        return {}
+
+    textos, maximo = {}, max(indices)
+    indice = 0
+    for _, elemento in iterparse(libro.open('xl/sharedStrings.xml')):
+        if elemento.tag == f'{_NS}si':
+            if indice in indices:
+                textos[indice] = ''.join(texto.text or '' for texto in elemento.iter(f'{_NS}t'))
+            elemento.clear()
+            if indice >= maximo:
+                break
+            indice += 1
+    return textos
+
+
+def leer_primeras_filas(archivo, cantidad_filas: int) -> Tuple[str, List[list]]:
+    """
+    Lee las primeras filas de la primera hoja de un .xlsx sin descomprimir el resto del libro.
+
+    Returns:
+        Tuple[str, List[list]]: Nombre de la hoja y valores de cada fila leída
+    """
+    with zipfile.ZipFile(archivo) as libro:
+        nombre_hoja, ruta_hoja = _ruta_primera_hoja(libro)
+
+        filas, celdas_compartidas = [], []
+        for _, elemento in iterparse(libro.open(ruta_hoja)):
+            if elemento.tag == f'{_NS}row':
+                # Las filas vacías no figuran en el XML; se completan para respetar la numeración de skiprows
+                numero_fila = int(elemento.get('r', len(filas) + 1))
+                filas.extend([] for _ in range(min(numero_fila, cantidad_filas + 1) - 1 - len(filas)))
+                if len(filas) >= cantidad_filas:
+                    break
+                fila, columna = {}, -1
+                for celda in elemento.iter(f'{_NS}c'):
+                    # 'r' es opcional: sin él la celda ocupa la columna siguiente a la anterior
+                    referencia = celda.get('r')
+                    columna = _indice_columna(referencia) if referencia else columna + 1
+                    valor = celda.find(f'{_NS}v')
+                    if valor is not None and valor.text is None:
+                        continue
+                    if celda.get('t') == 's' and valor is not None:
+                        fila[columna] = int(valor.text)
+                        celdas_compartidas.append((len(filas), columna))
+                    elif celda.get('t') == 'inlineStr':
+                        fila[columna] = ''.join(texto.text or '' for texto in celda.iter(f'{_NS}t'))
+                    elif valor is not None:
+                        fila[columna] = valor.text
+                filas.append([fila.get(columna) for columna in range(max(fila, default=-1) + 1)])
+                elemento.clear()
+                if len(filas) >= cantidad_filas:
+                    break
+
+        textos = _textos_compartidos(libro, {filas[fila][columna] for fila, columna in celdas_compartidas})
+        for fila, columna in celdas_compartidas:
+            filas[fila][columna] = textos.get(filas[fila][columna])
+
+    return nombre_hoja, filas
+
+
+def _buscar_encabezado(filas: List[tuple], columnas: List[str]) -> int:
+    """Devuelve el índice de la fila que contiene más columnas esperadas, o -1 si ninguna contiene alguna."""
+    mejor_fila, mejor_cantidad = -1, 0
+    for indice, fila in enumerate(filas):
+        cantidad = len(set(columnas) & {str(valor).strip() for valor in fila if valor is not None})
+        if cantidad > mejor_cantidad:
+            mejor_fila, mejor_cantidad = indice, cantidad
+    return mejor_fila
+
+
+def verificar_archivo(clave: str, archivo) -> List[str]:
+    """
+    Verifica el encabezado de un Excel de entrada sin leer sus datos.
+
+    Recorre en modo streaming únicamente las primeras filas de la primera hoja,
+    que es la que lee pandas.read_excel, y los textos compartidos que ellas usan.
+
+    Args:
+        clave: Clave de ARCHIVOS_ENTRADA
+        archivo: Ruta o archivo abierto en modo binario
+
+    Returns:
+        List[str]: Errores encontrados; vacía si el archivo es válido
+    """
+    configuracion = ARCHIVOS_ENTRADA[clave]
+    descripcion = configuracion['descripcion']
+    skiprows = configuracion['skiprows']
+    columnas = configuracion['columnas']
+
+    if isinstance(archivo, str) and os.path.getsize(archivo) == 0:
+        return [f"{descripcion}: el archivo '{archivo}' está vacío"]
+
+    try:
+        nombre_hoja, filas = leer_primeras_filas(archivo, max(FILAS_A_INSPECCIONAR, skiprows + 2))
+    except (zipfile.BadZipFile, KeyError, SyntaxError) as e:
+        return [f"{descripcion}: no se pudo abrir como Excel ({e})"]
+
+    if len(filas) <= skiprows:
+        return [f"{descripcion}: la hoja '{nombre_hoja}' no tiene encabezado en la fila {skiprows + 1}"]
+
+    encabezado = {str(valor).strip() for valor in filas[skiprows] if valor is not None}
+    faltantes = [columna for columna in columnas if columna not in encabezado]
+
+    if faltantes:
+        error = (f"{descripcion}: faltan las columnas {faltantes} en la fila {skiprows + 1} "
+                 f"de la hoja '{nombre_hoja}'")
+        fila_encontrada = _buscar_encabezado(filas, columnas)
+        if fila_encontrada not in (-1, skiprows):
+            error += (f"; el encabezado parece estar en la fila {fila_encontrada + 1} "
+                      f"(skiprows={fila_encontrada})")
+        return [error]
+
+    if len(filas) <= skiprows + 1 or all(valor is None for valor in filas[skiprows + 1]):
+        return [f"{descripcion}: no tiene filas de datos debajo del encabezado"]
+
+    return []
+
+
+def validar_entradas(rutas: Dict[str, str]) -> None:
+    """
+    Verifica todas las entradas antes de leerlas y corta el proceso ante el primer problema.
+
+    Args:
+        rutas: Ruta resuelta de cada archivo de entrada
+
+    Raises:
+        ErrorEntradaInvalida: Con el detalle de todos los archivos inválidos
+    """
+    print("Validando entradas...")
+
+    errores = []
+    for clave, ruta in rutas.items():
+        errores.extend(verificar_archivo(clave, ruta))
+
+    if errores:
+        raise ErrorEntradaInvalida("Entradas inválidas:\n" + "\n".join(f"  - {error}" for error in errores))
@@ -1,33 +1,51 @@
 import pandas as pd
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 from src.procesar_asientos_no_encotrados import procesar_asientos_no_encontrados
-from src.procesar_facturas_no_encontradas import test_facturas_no_encontradas, procesar_facturas_no_encontradas
+from src.procesar_facturas_no_encontradas import procesar_facturas_no_encontradas
 from utils.data_utils import (
     extraer_numero_de_recibo,
     extraer_numero_de_factura,
+    construir_diccionarios,
+    compactar_columnas,
+    particionar,
+    decodificar_columnas,
+    concatenar_compactados,
+    reporte_memoria,
 )
 from src.procesar_referencias_ppi import procesar_referencias_ppi
+from src.almacen_historico import guardar_corrida, determinar_periodo
+from src.metricas_incrementales import calcular_deltas, aplicar_deltas
+from src.validaciones import validar_resultados
+from src.entradas import ARCHIVOS_ENTRADA, RUTA_SALIDA_POR_DEFECTO, resolver_rutas
+from src.validar_entradas import validar_entradas
+from src.comparar_corridas import guardar_columnar
+from src.reportes_por_cliente import guardar_reportes_por_cliente
+from src.procedencia import agregar_procedencia, marcar_nivel, resumen_procedencia
+from utils.cache_entradas import leer_excel
+from utils.perfilado import medir_etapa
 
 
 def configurar_pandas() -> None:
     """Configura las opciones de visualización de pandas."""
     pd.set_option('display.max_columns', None)
     pd.set_option('display.width', None)
+    # Copy-on-write: las etapas pueden filtrar y agregar columnas sin copias defensivas
+    pd.set_option('mode.copy_on_write', True)
 
-def cargar_archivos() -> Dict[str, pd.DataFrame]:
+def cargar_archivos(rutas: Optional[Dict[str, str]] = None) -> Dict[str, pd.DataFrame]:
     """
     Carga todos los archivos Excel necesarios para el reporte.
     
+    Args:
+        rutas: Ruta o patrón glob por archivo de entrada; las claves ausentes usan la ruta por defecto
+    
     Returns:
         Dict[str, pd.DataFrame]: Diccionario con los DataFrames cargados
     """
     print("Leyendo archivos...")
     return {
-        'cobranza_recibo': pd.read_excel('./data/para_pruebas/v1/cobranza por recibo.xlsx'),
-        'cobranza_factura': pd.read_excel('./data/para_pruebas/v1/cobranza por factura.xlsx'),
-        'deudores_ventas': pd.read_excel('./data/para_pruebas/v1/mayor de ds x vtas.xlsx'),
-        'mayor_ppi': pd.read_excel('./data/para_pruebas/v1/cobros totales.xlsx'),
-        'detalle_de_recibos': pd.read_excel('./data/para_pruebas/Analisis financiero de cobranza por detalle de recibo.xlsx')
+        clave: leer_excel(ruta, ARCHIVOS_ENTRADA[clave]['skiprows'])
+        for clave, ruta in resolver_rutas(rutas).items()
     }
 
 def preprocesar_datos(dfs: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
@@ -42,6 +60,9 @@ def preprocesar_datos(dfs: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
     """
     print("Preprocesando Datos...")
     
+    # Código de procedencia (archivo y fila) de cada fila de entrada, antes de descartar filas
+    dfs = {clave: agregar_procedencia(df, clave) for clave, df in dfs.items()}
+    
     dfs['cobranza_recibo'] = extraer_numero_de_recibo(dfs['cobranza_recibo'], 'Recibo')
     dfs['cobranza_factura'] = extraer_numero_de_recibo(dfs['cobranza_factura'], 'Comprobante')
     dfs['deudores_ventas'] = extraer_numero_de_recibo(dfs['deudores_ventas'], 'Compr.Rel.')
@@ -51,7 +72,25 @@ def preprocesar_datos(dfs: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
     
     # Conversión de tipos y selección de columnas
     dfs['deudores_ventas'] = dfs['deudores_ventas'][['nro_recibo', 'Asiento']].astype({'Asiento': 'str'})
-    dfs['mayor_ppi']['Asiento'] = dfs['mayor_ppi']['Asiento'].astype(str)
+    dfs['mayor_ppi'] = dfs['mayor_ppi'].astype({'Asiento': 'str'})
+    dfs['detalle_de_recibos'] = dfs['detalle_de_recibos'].astype({'nro_recibo': 'int'})
+
+    return compactar_datos(dfs)
+
+def compactar_datos(dfs: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Convierte las columnas de texto repetidas en categóricas con diccionarios compartidos.
+    
+    Returns:
+        Dict[str, pd.DataFrame]: Diccionario con los DataFrames compactados
+    """
+    memoria_antes = reporte_memoria(dfs)
+
+    diccionarios = construir_diccionarios(dfs)
+    dfs = {nombre: compactar_columnas(df, diccionarios) for nombre, df in dfs.items()}
+
+    memoria = pd.DataFrame({'antes_MB': memoria_antes, 'despues_MB': reporte_memoria(dfs)})
+    print(f"Memoria de los datos de entrada:\n{memoria.round(2)}")
 
     return dfs
 
@@ -88,12 +127,33 @@ def crear_reporte_base(dfs: Dict[str, pd.DataFrame]) -> Tuple[pd.DataFrame, pd.D
     print(f"Cantidad de filas en reporte con cobranza por factura: {reporte.shape[0]}")
     
     # Separar facturas no encontradas
-    facturas_no_encontradas = reporte[reporte['nro_factura'].isna()]
-    reporte = reporte[reporte['nro_factura'].notna()]
+    reporte, facturas_no_encontradas = particionar(reporte, reporte['nro_factura'].notna())
     
     return reporte, facturas_no_encontradas
 
 
+def calcular_importes_por_dias(reporte: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega al detalle los días para cobrar y el importe por días de cada línea.
+    
+    Returns:
+        pd.DataFrame: Nuevo DataFrame de detalle; el recibido no se modifica
+    """
+    # Convertir fechas
+    fecha = pd.to_datetime(reporte['Fecha'])
+    fecha_factura = pd.to_datetime(reporte['FechaFactura'])
+    
+    # Calcular diferencia entre fecha de pago y de factura e importes por días
+    cantidad_de_dias_para_cobrar = (fecha - fecha_factura).dt.days
+
+    return reporte.assign(
+        Fecha=fecha,
+        FechaFactura=fecha_factura,
+        cantidad_de_dias_para_cobrar=cantidad_de_dias_para_cobrar,
+        importe_por_dias=cantidad_de_dias_para_cobrar * reporte['Haber']
+    )
+
+
 def calcular_dias_en_calle(reporte: pd.DataFrame) -> pd.DataFrame:
     """
     Calcula los días en calle y agrupa los resultados.
@@ -104,19 +164,14 @@ def calcular_dias_en_calle(reporte: pd.DataFrame) -> pd.DataFrame:
 
     print("Calculando Días en Calle...")
 
-    # Convertir fechas
-    reporte['Fecha'] = pd.to_datetime(reporte['Fecha'])
-    reporte['FechaFactura'] = pd.to_datetime(reporte['FechaFactura'])
-    
-    # Calcular diferencia entre fecha de pago y de factura e importes por días
-    reporte['cantidad_de_dias_para_cobrar'] = (reporte['Fecha'] - reporte['FechaFactura']).dt.days
-    reporte['importe_por_dias'] = reporte['cantidad_de_dias_para_cobrar'] * reporte['Haber']
+    if 'importe_por_dias' not in reporte.columns:
+        reporte = calcular_importes_por_dias(reporte)
     
     # Calcular el pago total por número de recibo
-    pagos_por_recibo = reporte.groupby('nro_recibo')['Pago'].first().reset_index()
+    pagos_por_recibo = reporte.groupby('nro_recibo', observed=True)['Pago'].first().reset_index()
     
     # Crear nuevo reporte agrupado por factura
-    df_agrupado = reporte.groupby('nro_factura').agg({
+    df_agrupado = reporte.groupby('nro_factura', observed=True).agg({
         'importe_por_dias': 'sum',
         'Haber': 'sum',
         'Nombre': 'first',
@@ -134,65 +189,121 @@ def calcular_dias_en_calle(reporte: pd.DataFrame) -> pd.DataFrame:
     # Calcular días en calle por cada factura
     df_agrupado['cantidad_de_dias_en_calle'] = df_agrupado['importe_por_dias'] / df_agrupado['Haber']
     
-    df_agrupado.rename(
+    df_agrupado = df_agrupado.rename(
         columns={
             'Haber': 'TotalFactura'
-            }, inplace=True)
+            })
     
     return df_agrupado[['Nombre', 'nro_recibo', 'TotalFactura', 'Pago', 'Asiento', 'nro_factura', 
                         'Referencia', 'cantidad_de_dias_en_calle', 'control_pago_total']]
 
 def guardar_reportes(resultado: pd.DataFrame, reporte_detallado: pd.DataFrame,
-                    asientos_no_encontrados: pd.DataFrame, facturas_no_encontradas: pd.DataFrame) -> None:
-    """Guarda todos los reportes en un archivo Excel."""
+                    asientos_no_encontrados: pd.DataFrame, facturas_no_encontradas: pd.DataFrame,
+                    excepciones: Optional[pd.DataFrame] = None,
+                    ruta_salida: str = RUTA_SALIDA_POR_DEFECTO) -> None:
+    """
+    Guarda todos los reportes en un archivo Excel.
+
+    El indicador por factura se guarda además en Parquet junto al Excel,
+    para poder comparar corridas sin volver a leer el Excel.
+    """
     
-    with pd.ExcelWriter('./data/reporte_dias_en_calle.xlsx') as writer:
+    # Las columnas categóricas se decodifican recién al escribir la salida
+    resultado = decodificar_columnas(resultado)
+    # El compacto incluye los diccionarios de categorías, que siguen en memoria junto a los códigos
+    memoria_compacta = reporte_memoria({'Detalle del Reporte': reporte_detallado})
+    reporte_detallado = decodificar_columnas(reporte_detallado)
+    memoria_decodificada = reporte_memoria({'Detalle del Reporte': reporte_detallado}).sum()
+    print(f"Memoria del detalle del reporte: {memoria_compacta.sum():.2f} MB compacto "
+          f"({memoria_compacta['Detalle del Reporte']:.2f} MB de datos y "
+          f"{memoria_compacta.get('diccionarios compartidos', 0.0):.2f} MB de diccionarios), "
+          f"{memoria_decodificada:.2f} MB decodificado")
+
+    asientos_no_encontrados = decodificar_columnas(asientos_no_encontrados)
+    facturas_no_encontradas = decodificar_columnas(facturas_no_encontradas)
+
+    with pd.ExcelWriter(ruta_salida) as writer:
         resultado.to_excel(writer, sheet_name='Indicador por Factura', index=False)
         reporte_detallado.to_excel(writer, sheet_name='Detalle del Reporte', index=False)
         asientos_no_encontrados.to_excel(writer, sheet_name='Asientos No Encontrados', index=False)
         facturas_no_encontradas.to_excel(writer, sheet_name='Facturas No Encontradas', index=False)
+        if excepciones is not None:
+            decodificar_columnas(excepciones).to_excel(writer, sheet_name='Excepciones', index=False)
 
-def main():
-    """Función principal que ejecuta el proceso completo."""
-    # Configuración inicial
-    configurar_pandas()
+    guardar_columnar(resultado, ruta_salida)
+
+def ejecutar_etapa(nombre: str, funcion, *args, mediciones: Optional[Dict[str, dict]] = None):
+    """
+    Ejecuta una etapa del proceso y, si se recibe mediciones, registra su duración y pico de memoria.
+    """
+    if mediciones is None:
+        return funcion(*args)
+
+    resultado, segundos, pico = medir_etapa(funcion, *args)
+    mediciones[nombre] = {'segundos': segundos, 'pico_MB': pico / 1024 ** 2}
+    return resultado
+
+def ejecutar_pipeline(dfs: Dict[str, pd.DataFrame],
+                      mediciones: Optional[Dict[str, dict]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Ejecuta todas las etapas del reporte sobre los DataFrames preprocesados.
     
-    # Cargar y preprocesar datos
-    dfs = cargar_archivos()
-    dfs = preprocesar_datos(dfs)
+    Args:
+        dfs: Diccionario con los DataFrames preprocesados
+        mediciones: Diccionario donde registrar duración y pico de memoria de cada etapa
     
+    Returns:
+        Dict[str, pd.DataFrame]: Resultado, detalle, asientos y facturas no encontradas y excepciones
+    """
     # Crear reporte base
-    reporte_base, facturas_no_encontradas = crear_reporte_base(dfs)
+    reporte_base, facturas_no_encontradas = ejecutar_etapa(
+        'crear_reporte_base', crear_reporte_base, dfs, mediciones=mediciones
+    )
     
     # Procesar referencias PPI
-    reporte_procesado, asientos_no_encontrados = procesar_referencias_ppi(
-        reporte_base, dfs['mayor_ppi']
+    reporte_procesado, asientos_no_encontrados = ejecutar_etapa(
+        'procesar_referencias_ppi', procesar_referencias_ppi,
+        reporte_base, dfs['mayor_ppi'], mediciones=mediciones
     )
+    reporte_procesado = marcar_nivel(reporte_procesado, 'referencia_ppi')
+
+    # Cantidad de filas por etapa, para controlar la expansión de los merges
+    conteos_por_etapa = {
+        'cobranza_recibo': len(dfs['cobranza_recibo']),
+        'reporte_base': len(reporte_base) + len(facturas_no_encontradas),
+        'reporte_procesado': len(reporte_procesado) + len(asientos_no_encontrados),
+    }
 
     # Procesar facturas no encontradas
-    facturas_encontradas, facturas_no_encontradas_final = procesar_facturas_no_encontradas(
+    facturas_encontradas, facturas_no_encontradas_final = ejecutar_etapa(
+        'procesar_facturas_no_encontradas', procesar_facturas_no_encontradas,
         facturas_no_encontradas,
         dfs['detalle_de_recibos'],
-        dfs['cobranza_factura']
+        dfs['cobranza_factura'],
+        mediciones=mediciones
     )
+    facturas_encontradas = marcar_nivel(facturas_encontradas, 'detalle_por_recibo_interno')
 
     # Procesar asientos no encontrados
-    df_resultado, asientos_no_encontrados = procesar_asientos_no_encontrados(
+    df_resultado, asientos_no_encontrados = ejecutar_etapa(
+        'procesar_asientos_no_encontrados', procesar_asientos_no_encontrados,
         asientos_no_encontrados,
-        dfs['detalle_de_recibos']
+        dfs['detalle_de_recibos'],
+        mediciones=mediciones
     )
+    df_resultado = marcar_nivel(df_resultado, 'detalle_por_factura')
 
     # Renombrar 'Pago_x' a 'Pago' en df_resultado para que coincida con reporte_procesado
-    df_resultado.rename(columns={
-        'Fecha del Valor': 'Fecha'}, inplace=True)
+    df_resultado = df_resultado.rename(columns={
+        'Fecha del Valor': 'Fecha'})
     
     
-    facturas_encontradas.rename(
+    facturas_encontradas = facturas_encontradas.rename(
         columns={
             'Fecha Comp.': 'FechaFactura',
             'Fecha del Valor': 'Fecha',
             'Total': 'Haber'
-            }, inplace=True)
+            })
 
     # print("INFO DF RESLUTADO")
     # print(len(df_resultado))
@@ -216,21 +327,94 @@ def main():
     # print(reporte_procesado[reporte_procesado['nro_recibo'] == '00084859'])
 
     # # Concatenar los DataFrames
-    reporte_concatenado = pd.concat([df_resultado, reporte_procesado, facturas_encontradas], ignore_index=True)
+    reporte_concatenado = concatenar_compactados([df_resultado, reporte_procesado, facturas_encontradas])
     
     reporte_concatenado = reporte_concatenado[reporte_concatenado['Haber'].notna()]
+    reporte_concatenado = ejecutar_etapa(
+        'calcular_importes_por_dias', calcular_importes_por_dias, reporte_concatenado, mediciones=mediciones
+    )
 
-    resultado_final = calcular_dias_en_calle(reporte_concatenado)
-    
-    # Guardar resultados
-    guardar_reportes(
+    resultado_final = ejecutar_etapa(
+        'calcular_dias_en_calle', calcular_dias_en_calle, reporte_concatenado, mediciones=mediciones
+    )
+    conteos_por_etapa['detalle_del_reporte'] = len(reporte_concatenado)
+
+    if 'procedencia' in reporte_concatenado.columns:
+        print(f"Filas del detalle por nivel de coincidencia: {resumen_procedencia(reporte_concatenado)}")
+
+    # Validar invariantes del resultado y de las etapas intermedias
+    excepciones = ejecutar_etapa(
+        'validar_resultados', validar_resultados,
         resultado_final,
         reporte_concatenado,
-        asientos_no_encontrados,
-        facturas_no_encontradas_final
+        reporte_procesado,
+        conteos_por_etapa,
+        mediciones=mediciones
     )
 
+    # Las filas no encontradas no tienen fila de origen en el detalle de recibos
+    return {
+        'resultado': resultado_final,
+        'reporte_detallado': reporte_concatenado,
+        'asientos_no_encontrados': asientos_no_encontrados.drop(columns='procedencia', errors='ignore'),
+        'facturas_no_encontradas': facturas_no_encontradas_final.drop(columns='procedencia', errors='ignore'),
+        'excepciones': excepciones
+    }
+
+def main(rutas: Optional[Dict[str, str]] = None, ruta_salida: str = RUTA_SALIDA_POR_DEFECTO,
+         guardar_historico: bool = True, directorio_por_cliente: Optional[str] = None,
+         reporte_completo: bool = True, procesos: Optional[int] = None, periodo: Optional[str] = None):
+    """
+    Función principal que ejecuta el proceso completo.
+    
+    Args:
+        rutas: Ruta o patrón glob por archivo de entrada; las claves ausentes usan la ruta por defecto
+        ruta_salida: Ruta del Excel de salida
+        guardar_historico: Si es True agrega la corrida al histórico y actualiza las métricas
+        directorio_por_cliente: Si se indica, guarda además un libro por cliente y un índice en ese directorio
+        reporte_completo: Si es False no escribe el Excel completo (sí su Parquet, para comparar corridas)
+        procesos: Procesos de trabajo para escribir los libros por cliente; por defecto uno por núcleo
+        periodo: Periodo 'AAAA-MM' con el que se guarda la corrida; por defecto el mes con más líneas cobradas
+    """
+    # Configuración inicial
+    configurar_pandas()
+    
+    # Verificar los encabezados de las entradas antes de leerlas completas
+    rutas = resolver_rutas(rutas)
+    validar_entradas(rutas)
+    
+    # Cargar y preprocesar datos
+    dfs = cargar_archivos(rutas)
+    dfs = preprocesar_datos(dfs)
+    
+    salidas = ejecutar_pipeline(dfs)
+    
+    # Guardar resultados
+    if reporte_completo:
+        guardar_reportes(
+            salidas['resultado'],
+            salidas['reporte_detallado'],
+            salidas['asientos_no_encontrados'],
+            salidas['facturas_no_encontradas'],
+            salidas['excepciones'],
+            ruta_salida
+        )
+    else:
+        guardar_columnar(decodificar_columnas(salidas['resultado']), ruta_salida)
+
+    if directorio_por_cliente:
+        guardar_reportes_por_cliente(
+            salidas['resultado'], salidas['reporte_detallado'], directorio_por_cliente, procesos
+        )
+
+    # Agregar la corrida al histórico y actualizar las métricas acumuladas
+    if guardar_historico:
+        periodo = periodo or determinar_periodo(salidas['reporte_detallado'])
+        guardar_corrida(salidas['resultado'], salidas['reporte_detallado'], periodo)
+        aplicar_deltas(calcular_deltas(salidas['reporte_detallado']), periodo)
+
+    return salidas
+
 
 if __name__ == "__main__":
-    main()
-    # test_facturas_no_encontradas()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,181 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+DIRECTORIO_TEST_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_data')
+DIRECTORIO_GOLDEN = os.path.join(DIRECTORIO_TEST_DATA, 'golden')
+
+# Presupuesto de cada etapa por conjunto de datos: (segundos, pico en MB), medidos con medir_etapa.
+# Los segundos dejan un margen amplio por el ruido entre máquinas; FACTOR_PRESUPUESTO_TIEMPO los
+# escala en máquinas lentas. La memoria que mide tracemalloc es estable, por eso su margen es menor.
+PRESUPUESTOS = {
+    'test_data': {
+        'procesar_asientos_no_encontrados': (0.5, 2.2),
+        'procesar_facturas_no_encontradas': (0.5, 1.4),
+    },
+    'sinteticos': {
+        'crear_reporte_base': (1.0, 0.6),
+        'procesar_referencias_ppi': (1.5, 1.7),
+        'procesar_facturas_no_encontradas': (1.0, 0.5),
+        'procesar_asientos_no_encontrados': (0.5, 0.15),
+        'calcular_importes_por_dias': (1.5, 1.9),
+        'calcular_dias_en_calle': (0.5, 1.0),
+        'validar_resultados': (0.5, 0.75),
+    },
+}
+FACTOR_PRESUPUESTO_TIEMPO = float(os.environ.get('FACTOR_PRESUPUESTO_TIEMPO', 1))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--actualizar-golden', action='store_true', default=False,
+        help='Regenera las salidas golden de tests/test_data/golden en lugar de compararlas'
+    )
+
+
+def _generar_datos_sinteticos(cantidad_recibos: int = 2000, semilla: int = 0):
+    """Genera DataFrames con la forma que tienen las entradas luego de preprocesar_datos."""
+    rng = np.random.default_rng(semilla)
+
+    recibos = np.arange(cantidad_recibos)
+    nro_recibo = pd.Series(recibos).map('{:08d}'.format)
+    asiento = pd.Series(7900000 + recibos).astype(str)
+    clientes = pd.Series(rng.integers(0, max(cantidad_recibos // 20, 1), cantidad_recibos)).map('CLIENTE {}'.format)
+
+    cobranza_recibo = pd.DataFrame({
+        'Nombre': clientes,
+        'Interno': 3300000 + recibos,
+        'nro_recibo': nro_recibo,
+        'Pago': rng.uniform(1000, 100000, cantidad_recibos).round(2)
+    })
+
+    deudores_ventas = pd.DataFrame({'nro_recibo': nro_recibo, 'Asiento': asiento})
+
+    # Dos facturas por recibo; el último 10% de los recibos no tiene facturas
+    con_factura = recibos[: int(cantidad_recibos * 0.9)]
+    cobranza_factura = pd.DataFrame({
+        'nro_recibo': np.repeat(nro_recibo.to_numpy()[con_factura], 2),
+        'nro_factura': [f'FA100-{numero:08d}' for numero in range(len(con_factura) * 2)],
+        'FechaFactura': pd.Timestamp('2024-11-01') + pd.to_timedelta(rng.integers(0, 30, len(con_factura) * 2), unit='D')
+    })
+
+    # Una línea de Debe y dos de Haber por referencia; el primer 10% de los asientos no está en el mayor
+    con_referencia = recibos[int(cantidad_recibos * 0.1):]
+    referencias = pd.Series(con_referencia).map('007-000-{:08d}'.format).to_numpy()
+    mayor_ppi = pd.DataFrame({
+        'Asiento': np.concatenate([asiento.to_numpy()[con_referencia], np.repeat('7800000', len(con_referencia) * 2)]),
+        'Nombre cuenta': 'CH CARTERA ELECTRONICO',
+        'Referencia': np.concatenate([referencias, np.repeat(referencias, 2)]),
+        'Fecha': pd.Timestamp('2024-12-01') + pd.to_timedelta(rng.integers(0, 60, len(con_referencia) * 3), unit='D'),
+        'Haber': np.concatenate([np.full(len(con_referencia), np.nan), rng.uniform(100, 50000, len(con_referencia) * 2).round(2)])
+    })
+
+    # El Pago de cada recibo con cheque es el total de sus dos líneas de Haber, salvo uno de cada 50
+    haber_por_recibo = mayor_ppi['Haber'].to_numpy()[len(con_referencia):].reshape(-1, 2).sum(axis=1).round(2)
+    haber_por_recibo[::50] += 500.0
+    cobranza_recibo.loc[con_referencia, 'Pago'] = haber_por_recibo
+
+    detalle_de_recibos = pd.DataFrame({
+        'nro_recibo': 3300000 + recibos,
+        'nro_factura': [f'FA100-{numero:08d}' for numero in range(cantidad_recibos)],
+        'Fecha Comp.': pd.Timestamp('2024-11-01'),
+        'Fecha del Valor': pd.Timestamp('2024-12-15'),
+        'Pago': rng.uniform(1000, 100000, cantidad_recibos).round(2)
+    })
+
+    return {
+        'cobranza_recibo': cobranza_recibo,
+        'cobranza_factura': cobranza_factura,
+        'deudores_ventas': deudores_ventas,
+        'mayor_ppi': mayor_ppi,
+        'detalle_de_recibos': detalle_de_recibos
+    }
+
+
+def _preprocesar_sinteticos(dfs):
+    """Agrega la procedencia y compacta los datos sintéticos como lo hace preprocesar_datos."""
+    from test import compactar_datos
+    from src.procedencia import agregar_procedencia
+
+    dfs = {clave: agregar_procedencia(df, clave) for clave, df in dfs.items()}
+    # Como en preprocesar_datos, de deudores por ventas sólo se conservan recibo y asiento
+    dfs['deudores_ventas'] = dfs['deudores_ventas'][['nro_recibo', 'Asiento']]
+    return compactar_datos(dfs)
+
+
+def _verificar_presupuesto(datos: str, etapa: str, segundos: float, pico_MB: float) -> None:
+    """Falla si la etapa supera su presupuesto de tiempo o de memoria."""
+    limite_segundos, limite_MB = PRESUPUESTOS[datos][etapa]
+    limite_segundos *= FACTOR_PRESUPUESTO_TIEMPO
+    assert segundos <= limite_segundos, (
+        f"{etapa} ({datos}): {segundos:.3f} s supera el presupuesto de {limite_segundos:.3f} s"
+    )
+    assert pico_MB <= limite_MB, (
+        f"{etapa} ({datos}): pico de {pico_MB:.2f} MB supera el presupuesto de {limite_MB:.2f} MB"
+    )
+
+
+def _leer_test_data(nombre: str) -> pd.DataFrame:
+    return pd.read_excel(os.path.join(DIRECTORIO_TEST_DATA, f'{nombre}.xlsx'))
+
+
+@pytest.fixture
+def generar_datos_sinteticos():
+    """Generador de entradas sintéticas con la forma que tienen luego de preprocesar_datos."""
+    return _generar_datos_sinteticos
+
+
+@pytest.fixture
+def preprocesar_sinteticos():
+    """Agrega la procedencia y compacta entradas sintéticas como lo hace preprocesar_datos."""
+    return _preprocesar_sinteticos
+
+
+@pytest.fixture
+def verificar_presupuesto():
+    """Verifica una medición contra su presupuesto de PRESUPUESTOS."""
+    return _verificar_presupuesto
+
+
+@pytest.fixture
+def leer_test_data():
+    """Lee un Excel de tests/test_data por nombre, sin extensión."""
+    return _leer_test_data
+
+
+@pytest.fixture
+def comparar_con_golden(request):
+    """
+    Compara un DataFrame con su salida golden en Parquet.
+
+    Con --actualizar-golden la salida golden se reescribe con el DataFrame recibido.
+    """
+    from utils.data_utils import decodificar_columnas
+
+    actualizar = request.config.getoption('--actualizar-golden')
+
+    def comparar(nombre: str, df: pd.DataFrame) -> None:
+        # Se comparan valores, no la codificación categórica, la unidad de las fechas ni el índice.
+        # Los nulos de las columnas de texto quedan como None, que es como los devuelve Parquet
+        df = decodificar_columnas(df).reset_index(drop=True)
+        df = df.astype({columna: 'datetime64[ns]' for columna in df.select_dtypes('datetime').columns})
+        df = df.assign(**{
+            columna: df[columna].where(df[columna].notna(), None) for columna in df.select_dtypes(object).columns
+        })
+        ruta = os.path.join(DIRECTORIO_GOLDEN, f'{nombre}.parquet')
+
+        if actualizar:
+            os.makedirs(DIRECTORIO_GOLDEN, exist_ok=True)
+            df.to_parquet(ruta, index=False)
+            return
+
+        if not os.path.exists(ruta):
+            pytest.fail(f"No existe la salida golden {ruta}; generarla con pytest --actualizar-golden")
+
+        esperado = pd.read_parquet(ruta)
+        esperado = esperado.astype({columna: 'datetime64[ns]' for columna in esperado.select_dtypes('datetime').columns})
+        pd.testing.assert_frame_equal(df, esperado, check_exact=False, rtol=1e-9, atol=1e-9, obj=nombre)
+
+    return comparar
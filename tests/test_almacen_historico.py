@@ -0,0 +1,64 @@
+import pandas as pd
+from src.almacen_historico import guardar_corrida, consultar_historial, determinar_periodo
+
+
+def _resultado(dias_cliente_a, dias_cliente_b):
+    return pd.DataFrame({
+        'Nombre': ['CLIENTE A', 'CLIENTE A', 'CLIENTE B'],
+        'nro_recibo': ['00000001', '00000001', '00000002'],
+        'TotalFactura': [100.0, 300.0, 200.0],
+        'Pago': [400.0, 400.0, 200.0],
+        'Asiento': ['7900001', '7900001', '7900002'],
+        'nro_factura': ['FA100-00000001', 'FA100-00000002', 'FA100-00000003'],
+        'Referencia': ['007-000-1', '007-000-1', '007-000-2'],
+        'cantidad_de_dias_en_calle': [dias_cliente_a[0], dias_cliente_a[1], dias_cliente_b],
+        'control_pago_total': [0.0, 0.0, 0.0]
+    })
+
+
+def _detalle():
+    return pd.DataFrame({
+        'Nombre': ['CLIENTE A'],
+        'nro_recibo': ['00000001'],
+        'Pago': [400.0],
+        'Asiento': ['7900001'],
+        'nro_factura': ['FA100-00000001'],
+        'FechaFactura': [pd.Timestamp('2024-11-01')],
+        'Referencia': ['007-000-1'],
+        'Fecha': [pd.Timestamp('2024-12-01')],
+        'Haber': [100.0],
+        'cantidad_de_dias_para_cobrar': [30],
+        'importe_por_dias': [3000.0]
+    })
+
+
+def test_guardar_y_consultar_corridas(tmp_path):
+    ruta = str(tmp_path / 'historico.sqlite')
+
+    guardar_corrida(_resultado((10.0, 30.0), 20.0), _detalle(), '2024-12', ruta)
+    guardar_corrida(_resultado((50.0, 50.0), 40.0), _detalle(), '2025-01', ruta)
+
+    historial = consultar_historial(ruta, clientes=['CLIENTE B'])
+    assert historial['periodo'].tolist() == ['2024-12', '2025-01']
+    assert historial['cantidad_de_dias_en_calle'].tolist() == [20.0, 40.0]
+
+    enero = consultar_historial(ruta, desde='2025-01')
+    assert enero['nro_factura'].tolist() == ['FA100-00000001', 'FA100-00000002', 'FA100-00000003']
+
+
+def test_volver_a_correr_un_periodo_reemplaza_la_corrida_anterior(tmp_path):
+    ruta = str(tmp_path / 'historico.sqlite')
+
+    guardar_corrida(_resultado((10.0, 10.0), 10.0), _detalle(), '2025-01', ruta)
+    guardar_corrida(_resultado((30.0, 30.0), 30.0), _detalle(), '2025-01', ruta)
+
+    historial = consultar_historial(ruta, clientes=['CLIENTE B'])
+    assert historial[['periodo', 'TotalFactura', 'cantidad_de_dias_en_calle']].values.tolist() == [
+        ['2025-01', 200.0, 30.0]
+    ]
+    assert len(consultar_historial(ruta)) == 3
+
+
+def test_determinar_periodo_usa_el_mes_con_mas_lineas():
+    detalle = pd.DataFrame({'Fecha': pd.to_datetime(['2025-01-10', '2025-01-31', '2025-02-03'])})
+    assert determinar_periodo(detalle) == '2025-01'
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from src.entradas import ARCHIVOS_ENTRADA
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _ejecutar_cli(*argumentos):
+    codigo = (
+        "import sys, cli; "
+        f"codigo = cli.main({list(argumentos)!r}); "
+        "print('pandas importado:', 'pandas' in sys.modules); "
+        "sys.exit(codigo)"
+    )
+    return subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True)
+
+
+def test_listar_y_validar_no_importan_pandas(tmp_path):
+    rutas = []
+    for clave, archivo in ARCHIVOS_ENTRADA.items():
+        pd.DataFrame([range(len(archivo['columnas']))], columns=archivo['columnas']).to_excel(
+            tmp_path / f'{clave}.xlsx', index=False
+        )
+        rutas += ['--' + clave.replace('_', '-'), str(tmp_path / f'{clave}*.xlsx')]
+
+    listado = _ejecutar_cli('listar', *rutas)
+    assert listado.returncode == 0
+    assert 'pandas importado: False' in listado.stdout
+
+    validacion = _ejecutar_cli('validar', *rutas)
+    assert validacion.returncode == 0, validacion.stdout
+    assert 'pandas importado: False' in validacion.stdout
+
+
+def test_validar_falla_si_falta_una_entrada(tmp_path):
+    resultado = _ejecutar_cli('validar', '--mayor-ppi', str(tmp_path / 'no_existe*.xlsx'))
+    assert resultado.returncode == 1
+    assert 'Mayor de PPIs' in resultado.stdout
+
+
+def test_subcomandos_informan_una_entrada_inexistente(tmp_path):
+    no_existe = str(tmp_path / 'no_existe.xlsx')
+    for argumentos in [
+        ('ejecutar', '--mayor-ppi', no_existe, '--sin-historico'),
+        ('benchmark', '--mayor-ppi', no_existe),
+        ('calentar-cache', '--mayor-ppi', no_existe),
+        ('comparar', no_existe, no_existe),
+        ('procedencia', no_existe, 'FA100-00000001'),
+    ]:
+        resultado = _ejecutar_cli(*argumentos)
+        assert resultado.returncode == 1, argumentos
+        assert 'Traceback' not in resultado.stderr, argumentos
@@ -0,0 +1,43 @@
+import pandas as pd
+from src.comparar_corridas import comparar_corridas, guardar_columnar, leer_corrida
+
+
+def _corrida(facturas, dias, pagos):
+    return pd.DataFrame({
+        'Nombre': ['CLIENTE'] * len(facturas),
+        'nro_factura': facturas,
+        'Pago': pagos,
+        'cantidad_de_dias_en_calle': dias,
+    })
+
+
+def test_comparar_corridas_clasifica_facturas():
+    anterior = _corrida(['FA-1', 'FA-2', 'FA-3', 'FA-3'], [10.0, 20.0, 5.0, 6.0], [100.0, 200.0, 50.0, 60.0])
+    actual = _corrida(['FA-1', 'FA-2', 'FA-3', 'FA-4'], [10.0, 25.0, 5.0, 1.0], [100.004, 200.0, 50.0, 10.0])
+    actual['nro_factura'] = actual['nro_factura'].astype('category')
+
+    diferencias = comparar_corridas(anterior, actual)
+
+    assert diferencias['agregadas']['nro_factura'].tolist() == ['FA-4']
+    # La segunda aparición de FA-3 ya no está en la corrida actual
+    assert diferencias['eliminadas'][['nro_factura', 'cantidad_de_dias_en_calle']].values.tolist() == [['FA-3', 6.0]]
+
+    # La diferencia de centavos en FA-1 queda por debajo del redondeo
+    modificadas = diferencias['modificadas']
+    assert modificadas['nro_factura'].tolist() == ['FA-2']
+    assert modificadas['columnas_modificadas'].tolist() == ['cantidad_de_dias_en_calle']
+    assert modificadas['delta_cantidad_de_dias_en_calle'].tolist() == [5.0]
+
+
+def test_leer_corrida_usa_el_parquet_junto_al_excel(tmp_path):
+    resultado = pd.DataFrame({'Nombre': ['CLIENTE'], 'nro_recibo': ['00084643'], 'nro_factura': ['FA-1'],
+                              'cantidad_de_dias_en_calle': [3.5]})
+    ruta = str(tmp_path / 'reporte.xlsx')
+    resultado.to_excel(ruta, sheet_name='Indicador por Factura', index=False)
+
+    # Sin Parquet se lee el Excel conservando los ceros a la izquierda y se deja el Parquet
+    pd.testing.assert_frame_equal(leer_corrida(ruta), resultado)
+    assert (tmp_path / 'reporte.parquet').exists()
+
+    guardar_columnar(resultado.assign(cantidad_de_dias_en_calle=4.0), ruta)
+    assert leer_corrida(ruta)['cantidad_de_dias_en_calle'].tolist() == [4.0]
@@ -0,0 +1,31 @@
+import pandas as pd
+from utils.data_utils import (
+    construir_diccionarios,
+    compactar_columnas,
+    decodificar_columnas,
+    concatenar_compactados
+)
+
+
+def test_compactar_con_diccionarios_compartidos():
+    dfs = {
+        'recibos': pd.DataFrame({'nro_recibo': ['00000002', '00000001'], 'Pago': [10.0, 20.0]}),
+        'facturas': pd.DataFrame({'nro_recibo': ['00000001', '00000003'], 'nro_factura': ['FA-2', 'FA-1']}),
+    }
+
+    diccionarios = construir_diccionarios(dfs)
+    dfs = {nombre: compactar_columnas(df, diccionarios) for nombre, df in dfs.items()}
+
+    assert list(diccionarios['nro_recibo'].categories) == ['00000001', '00000002', '00000003']
+
+    # El merge entre columnas con el mismo diccionario conserva los códigos
+    reporte = dfs['recibos'].merge(dfs['facturas'], on='nro_recibo', how='left')
+    assert isinstance(reporte['nro_recibo'].dtype, pd.CategoricalDtype)
+
+    concatenado = concatenar_compactados([reporte, dfs['facturas'].iloc[:0], dfs['facturas']])
+    assert isinstance(concatenado['nro_factura'].dtype, pd.CategoricalDtype)
+    assert len(concatenado) == 4
+
+    decodificado = decodificar_columnas(concatenado)
+    assert decodificado['nro_recibo'].tolist() == ['00000002', '00000001', '00000001', '00000003']
+    assert decodificado['nro_recibo'].dtype == object
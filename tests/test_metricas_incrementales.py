@@ -0,0 +1,112 @@
+import pandas as pd
+from src.metricas_incrementales import (
+    calcular_deltas,
+    aplicar_deltas,
+    ventanas_moviles,
+    antiguedad_por_cliente,
+    cohortes_por_mes_factura,
+    tendencia_por_cliente,
+    tendencia_movil
+)
+
+
+def _detalle(filas):
+    detalle = pd.DataFrame(filas, columns=['Nombre', 'FechaFactura', 'Fecha', 'Haber'])
+    detalle['FechaFactura'] = pd.to_datetime(detalle['FechaFactura'])
+    detalle['Fecha'] = pd.to_datetime(detalle['Fecha'])
+    detalle['cantidad_de_dias_para_cobrar'] = (detalle['Fecha'] - detalle['FechaFactura']).dt.days
+    detalle['importe_por_dias'] = detalle['cantidad_de_dias_para_cobrar'] * detalle['Haber']
+    return detalle
+
+
+def test_metricas_se_actualizan_por_periodo(tmp_path):
+    ruta = str(tmp_path / 'historico.sqlite')
+
+    diciembre = _detalle([
+        ('CLIENTE A', '2024-10-01', '2024-12-10', 100.0),
+        ('CLIENTE B', '2024-12-01', '2024-12-11', 300.0),
+    ])
+    enero = _detalle([
+        ('CLIENTE A', '2024-12-20', '2025-01-09', 200.0),
+    ])
+
+    aplicar_deltas(calcular_deltas(diciembre), '2024-12', ruta)
+    aplicar_deltas(calcular_deltas(enero), '2025-01', ruta)
+
+    metricas = ventanas_moviles('2025-01-09', ventanas=(30, 90), ruta=ruta).set_index('ventana')
+    assert metricas.loc[30, 'dias_en_calle_ponderados'] == (10 * 300 + 20 * 200) / 500
+    assert metricas.loc[90, 'dias_en_calle_ponderados'] == (70 * 100 + 10 * 300 + 20 * 200) / 600
+
+    # Volver a aplicar una corrida reemplaza sus agregados en lugar de duplicarlos
+    aplicar_deltas(calcular_deltas(enero), '2025-01', ruta)
+    por_cliente = ventanas_moviles('2025-01-09', ventanas=(90,), por_cliente=True, ruta=ruta).set_index('Nombre')
+    assert por_cliente.loc['CLIENTE A', 'Haber'] == 300.0
+
+    antiguedad = antiguedad_por_cliente(ruta).set_index('Nombre')
+    assert antiguedad.loc['CLIENTE A', '61-90'] == 100.0
+    assert antiguedad.loc['CLIENTE A', '1-30'] == 200.0
+
+    cohortes = cohortes_por_mes_factura(ruta=ruta).set_index('mes_factura')
+    assert cohortes['Haber'].to_dict() == {'2024-10': 100.0, '2024-12': 500.0}
+
+
+def test_extractos_superpuestos_no_duplican_lineas(tmp_path):
+    ruta = str(tmp_path / 'historico.sqlite')
+
+    enero = _detalle([
+        ('CLIENTE A', '2024-12-20', '2025-01-20', 100.0),
+    ])
+    # El extracto de febrero vuelve a traer el cobro de enero
+    febrero = _detalle([
+        ('CLIENTE A', '2024-12-20', '2025-01-20', 100.0),
+        ('CLIENTE A', '2025-01-25', '2025-02-04', 100.0),
+    ])
+
+    aplicar_deltas(calcular_deltas(enero), '2025-01', ruta)
+    aplicar_deltas(calcular_deltas(febrero), '2025-02', ruta)
+
+    metricas = ventanas_moviles('2025-02-04', ventanas=(30,), ruta=ruta).set_index('ventana')
+    assert metricas.loc[30, 'Haber'] == 200.0
+    assert metricas.loc[30, 'dias_en_calle_ponderados'] == (31 * 100 + 10 * 100) / 200
+
+    antiguedad = antiguedad_por_cliente(ruta).set_index('Nombre')
+    assert antiguedad.loc['CLIENTE A', '31-60'] == 100.0
+    assert antiguedad.loc['CLIENTE A', '1-30'] == 100.0
+
+    cohortes = cohortes_por_mes_factura(ruta=ruta).set_index('mes_factura')
+    assert cohortes['Haber'].to_dict() == {'2024-12': 100.0, '2025-01': 100.0}
+
+
+def test_ventanas_moviles_sin_metricas_devuelve_vacio(tmp_path):
+    metricas = ventanas_moviles(ruta=str(tmp_path / 'historico.sqlite'), por_cliente=True)
+    assert metricas.empty
+    assert list(metricas.columns) == ['ventana', 'Nombre', 'Haber', 'importe_por_dias', 'dias_en_calle_ponderados']
+
+
+def test_tendencias_por_mes_de_cobro(tmp_path):
+    ruta = str(tmp_path / 'historico.sqlite')
+
+    diciembre = _detalle([
+        ('CLIENTE A', '2024-11-01', '2024-12-01', 100.0),
+        ('CLIENTE B', '2024-11-21', '2024-12-01', 300.0),
+    ])
+    # El extracto de febrero repite un cobro de diciembre y en enero no hubo cobros
+    febrero = _detalle([
+        ('CLIENTE A', '2024-11-01', '2024-12-01', 100.0),
+        ('CLIENTE A', '2025-01-22', '2025-02-01', 200.0),
+    ])
+
+    aplicar_deltas(calcular_deltas(diciembre), '2024-12', ruta)
+    aplicar_deltas(calcular_deltas(febrero), '2025-02', ruta)
+
+    tendencia = tendencia_por_cliente(ruta, clientes=['CLIENTE A'])
+    assert tendencia[['periodo', 'Haber', 'dias_en_calle_ponderados']].values.tolist() == [
+        ['2024-12', 100.0, 30.0], ['2025-02', 200.0, 10.0]
+    ]
+
+    movil = tendencia_movil(ruta, ventana=2).set_index('periodo')
+    assert movil.index.tolist() == ['2024-12', '2025-01', '2025-02']
+    # Diciembre queda fuera de la ventana de dos meses que termina en febrero
+    assert movil.loc['2025-02', 'dias_en_calle_movil'] == 10.0
+    assert movil.loc['2025-01', 'dias_en_calle_movil'] == 30.0
+    assert pd.isna(movil.loc['2025-01', 'dias_en_calle_ponderados'])
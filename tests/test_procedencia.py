@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+from test import ejecutar_pipeline
+from src.procedencia import agregar_procedencia, expandir_procedencia, marcar_nivel, procedencia_de_factura
+
+
+def test_expandir_procedencia_recupera_archivo_fila_y_nivel():
+    entrada = pd.DataFrame({'Haber': [1.0, 2.0, 3.0]}, index=[4, 7, 1048575])
+    marcado = marcar_nivel(agregar_procedencia(entrada, 'mayor_ppi'), 'referencia_ppi')
+
+    assert marcado['procedencia'].dtype == np.int32
+    expandido = expandir_procedencia(marcado['procedencia'])
+    assert expandido['archivo'].tolist() == ['mayor_ppi'] * 3
+    assert expandido['fila'].tolist() == [4, 7, 1048575]
+    assert expandido['fila_excel'].tolist() == [6, 9, 1048577]
+    assert expandido['nivel'].tolist() == ['referencia_ppi'] * 3
+
+
+def test_marcar_nivel_sin_fila_de_origen():
+    sin_origen = pd.DataFrame({'procedencia': [np.nan]})
+    expandido = expandir_procedencia(marcar_nivel(sin_origen, 'detalle_por_factura')['procedencia'])
+    assert expandido[['archivo', 'fila', 'nivel']].values.tolist() == [[None, -1, 'detalle_por_factura']]
+
+
+def test_pipeline_propaga_procedencia(generar_datos_sinteticos, preprocesar_sinteticos):
+    dfs = preprocesar_sinteticos(generar_datos_sinteticos(200))
+
+    with pd.option_context('mode.copy_on_write', True):
+        detalle = ejecutar_pipeline(dfs)['reporte_detallado']
+
+    expandido = expandir_procedencia(detalle['procedencia'])
+    por_nivel = expandido.groupby('nivel')['archivo'].unique().map(list).to_dict()
+    assert por_nivel == {'detalle_por_factura': ['detalle_de_recibos'], 'referencia_ppi': ['mayor_ppi']}
+
+    # El importe de cada fila es el de la fila de origen indicada
+    fila = procedencia_de_factura(detalle, detalle['nro_factura'].iloc[-1]).iloc[0]
+    origen = dfs[fila['archivo']].loc[fila['fila']]
+    assert fila['Haber'] == origen['Haber' if fila['archivo'] == 'mayor_ppi' else 'Pago']
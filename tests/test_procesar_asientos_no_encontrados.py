@@ -1,9 +1,19 @@
-import pandas as pd
 from src.procesar_asientos_no_encotrados import procesar_asientos_no_encontrados
+from utils.perfilado import medir_etapa
 
-def test_procesar_asientos_no_encotrados():
-    df_asientos_no_encontrados = pd.read_excel('./tests/test_data/test_asientos_no_encontrados.xlsx')
-    df_recibos = pd.read_excel('./tests/test_data/test_detalle_recibos.xlsx')
 
-    df_resultado, asientos_no_encontrados = procesar_asientos_no_encontrados(df_asientos_no_encontrados, df_recibos)
-    df_resultado.to_excel('./tests/test_data/test_resultado_asientos_no_encontrados.xlsx', index=False)
+def test_procesar_asientos_no_encotrados(leer_test_data, verificar_presupuesto, comparar_con_golden):
+    df_asientos_no_encontrados = leer_test_data('test_asientos_no_encontrados')
+    df_recibos = leer_test_data('test_detalle_recibos')
+
+    (df_resultado, asientos_no_encontrados), segundos, pico = medir_etapa(
+        procesar_asientos_no_encontrados, df_asientos_no_encontrados, df_recibos
+    )
+
+    verificar_presupuesto('test_data', 'procesar_asientos_no_encontrados', segundos, pico / 1024 ** 2)
+    comparar_con_golden('test_data_asientos_encontrados', df_resultado)
+    comparar_con_golden('test_data_asientos_no_encontrados', asientos_no_encontrados)
+
+    # Cada asiento termina encontrado o no encontrado, y el importe encontrado sale del detalle de recibos
+    assert set(df_resultado['nro_factura']).isdisjoint(asientos_no_encontrados['nro_factura'])
+    assert df_resultado['Haber'].notna().all()
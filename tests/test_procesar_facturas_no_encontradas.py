@@ -0,0 +1,21 @@
+from src.procesar_facturas_no_encontradas import procesar_facturas_no_encontradas
+from utils.perfilado import medir_etapa
+
+
+def test_procesar_facturas_no_encontradas(leer_test_data, verificar_presupuesto, comparar_con_golden):
+    df_facturas_no_encontradas = leer_test_data('test_facturas_no_encontradas')
+    df_detalle_recibos = leer_test_data('test_detalle_recibos')
+    df_cobranza_por_factura = leer_test_data('test_cobranza_por_factura')
+
+    (facturas_encontradas, facturas_no_encontradas), segundos, pico = medir_etapa(
+        procesar_facturas_no_encontradas, df_facturas_no_encontradas, df_detalle_recibos, df_cobranza_por_factura
+    )
+
+    verificar_presupuesto('test_data', 'procesar_facturas_no_encontradas', segundos, pico / 1024 ** 2)
+    comparar_con_golden('test_data_facturas_encontradas', facturas_encontradas)
+    comparar_con_golden('test_data_facturas_no_encontradas', facturas_no_encontradas)
+
+    assert facturas_encontradas['nro_factura'].notna().all()
+    assert facturas_no_encontradas['nro_factura'].isna().all()
+    # La etapa no modifica el DataFrame recibido
+    assert df_facturas_no_encontradas['Interno'].dtype == leer_test_data('test_facturas_no_encontradas')['Interno'].dtype
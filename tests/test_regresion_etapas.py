@@ -0,0 +1,27 @@
+import pandas as pd
+from test import ejecutar_pipeline
+
+
+def test_pipeline_contra_golden_y_presupuestos(generar_datos_sinteticos, preprocesar_sinteticos,
+                                               verificar_presupuesto, comparar_con_golden):
+    dfs = preprocesar_sinteticos(generar_datos_sinteticos())
+    columnas_de_entrada = {clave: list(df.columns) for clave, df in dfs.items()}
+
+    mediciones = {}
+    with pd.option_context('mode.copy_on_write', True):
+        salidas = ejecutar_pipeline(dfs, mediciones)
+
+    # Todas las etapas medidas tienen presupuesto, y ninguna lo supera
+    assert set(mediciones) == {
+        'crear_reporte_base', 'procesar_referencias_ppi', 'procesar_facturas_no_encontradas',
+        'procesar_asientos_no_encontrados', 'calcular_importes_por_dias', 'calcular_dias_en_calle',
+        'validar_resultados',
+    }
+    for etapa, medicion in mediciones.items():
+        verificar_presupuesto('sinteticos', etapa, medicion['segundos'], medicion['pico_MB'])
+
+    for nombre, df in salidas.items():
+        comparar_con_golden(f'sinteticos_{nombre}', df)
+
+    # Las etapas no modifican los DataFrames que reciben
+    assert {clave: list(df.columns) for clave, df in dfs.items()} == columnas_de_entrada
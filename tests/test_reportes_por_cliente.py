@@ -0,0 +1,53 @@
+import openpyxl
+import pandas as pd
+import pytest
+from src.reportes_por_cliente import guardar_reportes_por_cliente, nombre_archivo_cliente, particionar_por_cliente
+from utils.data_utils import compactar_columnas, construir_diccionarios
+
+
+def test_nombre_archivo_cliente_distingue_nombres_parecidos():
+    assert nombre_archivo_cliente('ACME S.A.') != nombre_archivo_cliente('ACME S/A.')
+    assert '/' not in nombre_archivo_cliente('ACME S/A.')
+
+
+@pytest.mark.parametrize('procesos', [1, 2])
+def test_guardar_reportes_por_cliente(tmp_path, procesos):
+    resultado = pd.DataFrame({
+        'Nombre': ['ACME', 'ACME', 'OTRO'],
+        'nro_factura': ['FA-1', 'FA-2', 'FA-3'],
+        'TotalFactura': [100.0, 50.0, 10.0],
+        'cantidad_de_dias_en_calle': [10.0, 20.0, 5.0],
+    })
+    detalle = pd.DataFrame({
+        'Nombre': ['ACME', 'ACME', 'ACME', 'OTRO'],
+        'nro_factura': ['FA-1', 'FA-1', 'FA-2', 'FA-3'],
+        'Haber': [60.0, 40.0, 50.0, 10.0],
+    })
+    diccionarios = construir_diccionarios({'resultado': resultado, 'detalle': detalle})
+    resultado = compactar_columnas(resultado, diccionarios)
+    detalle = compactar_columnas(detalle, diccionarios)
+
+    indice = guardar_reportes_por_cliente(resultado, detalle, str(tmp_path), procesos=procesos)
+
+    assert indice[['Nombre', 'facturas', 'filas_detalle', 'promedio_dias_en_calle']].values.tolist() == [
+        ['ACME', 2, 3, 15.0], ['OTRO', 1, 1, 5.0]
+    ]
+    detalle_acme = pd.read_excel(tmp_path / indice.loc[0, 'archivo'], sheet_name='Detalle del Reporte')
+    assert detalle_acme['Haber'].tolist() == [60.0, 40.0, 50.0]
+
+    hoja = openpyxl.load_workbook(tmp_path / 'indice.xlsx')['Clientes']
+    assert hoja.cell(row=3, column=6).hyperlink.target == indice.loc[1, 'archivo']
+
+
+def test_particionar_por_cliente_conserva_filas_sin_nombre():
+    resultado = pd.DataFrame({'Nombre': ['ACME', None], 'nro_factura': ['FA-1', 'FA-2']})
+    detalle = pd.DataFrame({'Nombre': ['ACME', None, None], 'nro_factura': ['FA-1', 'FA-2', 'FA-2']})
+    diccionarios = construir_diccionarios({'resultado': resultado, 'detalle': detalle})
+
+    particiones = particionar_por_cliente(
+        compactar_columnas(resultado, diccionarios), compactar_columnas(detalle, diccionarios)
+    )
+
+    assert [(nombre, len(indicador), len(detalle)) for nombre, indicador, detalle in particiones] == [
+        ('SIN CLIENTE', 1, 2), ('ACME', 1, 1)
+    ]
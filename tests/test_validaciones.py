@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from src.validaciones import validar_resultados
+
+
+def test_validar_resultados_detecta_cada_invariante():
+    resultado = pd.DataFrame({
+        'nro_factura': ['FA-1', 'FA-2', 'FA-2', 'FA-3'],
+        'cantidad_de_dias_en_calle': [10.0, -5.0, -5.0, 20.0],
+    })
+    # Como en el camino de PPIs, cada factura del recibo R-1 repite las dos líneas de su cheque,
+    # que suman el Pago; al recibo R-2 le faltan 150 de Haber
+    reporte_detallado = pd.DataFrame({
+        'nro_factura': ['FA-1', 'FA-1', 'FA-2', 'FA-2', 'FA-3'],
+        'nro_recibo': ['R-1', 'R-1', 'R-1', 'R-1', 'R-2'],
+        'Pago': [300.0, 300.0, 300.0, 300.0, 250.0],
+        'Haber': [100.0, 199.5, 100.0, 199.5, 100.0],
+        'procedencia': [11, 12, 11, 12, 21],
+        'cantidad_de_dias_para_cobrar': [10, 10, -5, -5, 20],
+    })
+    reporte_procesado = pd.DataFrame({
+        'Referencia': ['REF-1', 'REF-2', 'REF-2'],
+        'Haber': [100.0, np.nan, np.nan],
+    })
+    conteos_por_etapa = {'cobranza_recibo': 10, 'reporte_base': 60, 'reporte_procesado': 70}
+
+    excepciones = validar_resultados(
+        resultado, reporte_detallado, reporte_procesado, conteos_por_etapa
+    )
+
+    por_invariante = excepciones.groupby('invariante')['clave'].apply(list).to_dict()
+    assert por_invariante == {
+        'control_pago': ['R-2'],
+        'dias_en_calle_negativos': ['FA-2', 'FA-2'],
+        'dias_para_cobrar_negativos': ['FA-2', 'FA-2'],
+        'facturas_duplicadas': ['FA-2'],
+        'referencias_huerfanas': ['REF-2'],
+        'expansion_de_filas': ['cobranza_recibo -> reporte_base'],
+    }
+    assert excepciones.loc[excepciones['invariante'] == 'control_pago', 'valor'].tolist() == [150.0]
+
+
+def test_validar_resultados_respeta_la_configuracion():
+    resultado = pd.DataFrame({
+        'nro_factura': ['FA-1'],
+        'cantidad_de_dias_en_calle': [-1.0],
+    })
+    reporte_detallado = pd.DataFrame({
+        'nro_factura': ['FA-1'], 'nro_recibo': ['R-1'], 'Pago': [250.0], 'Haber': [100.0], 'procedencia': [11],
+        'cantidad_de_dias_para_cobrar': [-1],
+    })
+
+    excepciones = validar_resultados(
+        resultado, reporte_detallado,
+        configuracion={'tolerancia_pago': 200.0, 'invariantes': ('control_pago',)}
+    )
+
+    assert excepciones.empty
+    assert list(excepciones.columns) == ['invariante', 'clave', 'valor', 'descripcion']
@@ -0,0 +1,60 @@
+import re
+import zipfile
+
+import pandas as pd
+import pytest
+from src.validar_entradas import ErrorEntradaInvalida, leer_primeras_filas, validar_entradas, verificar_archivo
+
+
+def _escribir(ruta, filas):
+    pd.DataFrame(filas).to_excel(ruta, index=False, header=False)
+    return str(ruta)
+
+
+def test_verificar_archivo_acepta_encabezado_esperado(tmp_path):
+    ruta = _escribir(tmp_path / 'deudores.xlsx', [['Compr.Rel.', 'Asiento', 'Debe'], ['FA-1', 10, 5.0]])
+    assert verificar_archivo('deudores_ventas', ruta) == []
+
+
+def test_verificar_archivo_sugiere_skiprows(tmp_path):
+    ruta = _escribir(tmp_path / 'deudores.xlsx', [
+        ['Empresa: 0007 del 01/12/2024 al 31/01/2025', None],
+        [None, None],
+        ['Compr.Rel.', 'Asiento'],
+        ['FA-1', 10],
+    ])
+
+    errores = verificar_archivo('deudores_ventas', ruta)
+
+    assert len(errores) == 1
+    assert "faltan las columnas ['Compr.Rel.', 'Asiento']" in errores[0]
+    assert 'skiprows=2' in errores[0]
+
+
+def test_validar_entradas_reune_todos_los_errores(tmp_path):
+    vacio = tmp_path / 'vacio.xlsx'
+    vacio.write_bytes(b'')
+    sin_datos = _escribir(tmp_path / 'sin_datos.xlsx', [['Compr.Rel.', 'Asiento']])
+
+    with pytest.raises(ErrorEntradaInvalida) as error:
+        validar_entradas({'mayor_ppi': str(vacio), 'deudores_ventas': sin_datos})
+
+    assert 'está vacío' in str(error.value)
+    assert 'no tiene filas de datos' in str(error.value)
+
+
+def test_leer_primeras_filas_sin_referencias_de_celda(tmp_path):
+    # Algunos generadores omiten el atributo 'r' (opcional) de las celdas
+    original = _escribir(tmp_path / 'original.xlsx', [['Compr.Rel.', 'Asiento', 'Debe'], ['FA-1', 10, 5.5]])
+    ruta = tmp_path / 'deudores.xlsx'
+    with zipfile.ZipFile(original) as entrada, zipfile.ZipFile(ruta, 'w') as salida:
+        for nombre in entrada.namelist():
+            contenido = entrada.read(nombre)
+            if nombre.startswith('xl/worksheets/'):
+                contenido = re.sub(rb'(<c[^>]*?) r="[A-Z]+[0-9]+"', rb'\1', contenido)
+            salida.writestr(nombre, contenido)
+
+    _, filas = leer_primeras_filas(str(ruta), 2)
+
+    assert filas == [['Compr.Rel.', 'Asiento', 'Debe'], ['FA-1', '10', '5.5']]
+    assert verificar_archivo('deudores_ventas', str(ruta)) == []
@@ -0,0 +1,51 @@
+import hashlib
+import os
+
+import pandas as pd
+
+DIRECTORIO_CACHE_POR_DEFECTO = './data/cache'
+
+
+def ruta_cache(ruta: str, skiprows: int = 0, directorio: str = DIRECTORIO_CACHE_POR_DEFECTO) -> str:
+    """
+    Devuelve la ruta del Parquet cacheado para un Excel.
+
+    La clave incluye tamaño y fecha de modificación, por lo que un Excel re-exportado
+    nunca reutiliza la caché de su versión anterior.
+    """
+    estado = os.stat(ruta)
+    clave = f"{os.path.abspath(ruta)}|{skiprows}|{estado.st_size}|{estado.st_mtime_ns}"
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    return os.path.join(directorio, f"{nombre}-{hashlib.sha1(clave.encode()).hexdigest()[:12]}.parquet")
+
+
+def leer_excel(ruta: str, skiprows: int = 0, directorio_cache: str = DIRECTORIO_CACHE_POR_DEFECTO) -> pd.DataFrame:
+    """Lee un Excel, usando su versión Parquet cacheada si está al día."""
+    cache = ruta_cache(ruta, skiprows, directorio_cache)
+    if os.path.exists(cache):
+        return pd.read_parquet(cache)
+    return pd.read_excel(ruta, skiprows=skiprows)
+
+
+def calentar_cache(ruta: str, skiprows: int = 0, directorio_cache: str = DIRECTORIO_CACHE_POR_DEFECTO) -> bool:
+    """
+    Convierte un Excel a Parquet en el directorio de caché.
+
+    Returns:
+        bool: True si el archivo quedó cacheado, False si sus columnas no se pueden guardar en Parquet
+    """
+    cache = ruta_cache(ruta, skiprows, directorio_cache)
+    if os.path.exists(cache):
+        return True
+
+    os.makedirs(directorio_cache, exist_ok=True)
+    df = pd.read_excel(ruta, skiprows=skiprows)
+    try:
+        df.to_parquet(cache, index=False)
+    except (TypeError, ValueError) as e:
+        # Columnas con tipos mezclados: se sigue leyendo el Excel en cada corrida
+        print(f"No se pudo cachear {ruta}: {e}")
+        if os.path.exists(cache):
+            os.unlink(cache)
+        return False
+    return True
@@ -1,12 +1,126 @@
+import numpy as np
 import pandas as pd
+from typing import Dict, List, Tuple
 
 def extraer_numero_de_recibo(df: pd.DataFrame, nombre_columna_recibo: str) -> pd.DataFrame:
-    df['nro_recibo'] = df[nombre_columna_recibo].astype(str).str.extract(r'REC\s*-?\s*(\d+)')
+    df = df.assign(nro_recibo=df[nombre_columna_recibo].astype(str).str.extract(r'REC\s*-?\s*(\d+)', expand=False))
     df = df.dropna(subset=['nro_recibo'])
     return df
 
 
 
 def extraer_numero_de_factura(df: pd.DataFrame, columna) -> pd.DataFrame:
-    df['nro_factura'] = df[columna].str.slice(start=2, stop=22)
-    return df
+    return df.assign(nro_factura=df[columna].str.slice(start=2, stop=22))
+
+
+def particionar(df: pd.DataFrame, mascara: pd.Series) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Separa un DataFrame en las filas que cumplen la máscara y las que no, evaluándola una sola vez.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Filas que cumplen y filas que no cumplen la máscara
+    """
+    mascara = mascara.to_numpy(dtype=bool)
+    return df[mascara], df[~mascara]
+
+
+COLUMNAS_A_COMPACTAR = ['Nombre', 'Nombre cuenta', 'Referencia', 'Asiento', 'nro_recibo', 'nro_factura']
+
+
+def construir_diccionarios(dfs: Dict[str, pd.DataFrame],
+                           columnas: List[str] = COLUMNAS_A_COMPACTAR) -> Dict[str, pd.CategoricalDtype]:
+    """
+    Construye un diccionario compartido de categorías por columna con los valores de todos los DataFrames.
+
+    Usar el mismo dtype en todas las etapas permite que los merges y concatenaciones
+    conserven las columnas como códigos enteros en lugar de volver a texto.
+    """
+    diccionarios = {}
+    for columna in columnas:
+        valores = [
+            df[columna].dropna().unique()
+            for df in dfs.values()
+            if columna in df.columns and df[columna].dtype == object
+        ]
+        if valores:
+            categorias = pd.Index(pd.unique(np.concatenate(valores)))
+            try:
+                # Categorías ordenadas para que los groupby mantengan el orden alfabético
+                categorias = categorias.sort_values()
+            except TypeError:
+                pass
+            diccionarios[columna] = pd.CategoricalDtype(categorias)
+    return diccionarios
+
+
+def compactar_columnas(df: pd.DataFrame, diccionarios: Dict[str, pd.CategoricalDtype]) -> pd.DataFrame:
+    """Convierte las columnas de texto presentes en diccionarios a su dtype categórico compartido."""
+    conversiones = {
+        columna: dtype for columna, dtype in diccionarios.items()
+        if columna in df.columns and df[columna].dtype == object
+    }
+    return df.astype(conversiones) if conversiones else df
+
+
+def decodificar_columnas(df: pd.DataFrame) -> pd.DataFrame:
+    """Vuelve a texto las columnas categóricas, para usar al momento de escribir la salida."""
+    conversiones = {
+        columna: object for columna, dtype in df.dtypes.items()
+        if isinstance(dtype, pd.CategoricalDtype)
+    }
+    return df.astype(conversiones) if conversiones else df
+
+
+def concatenar_compactados(dfs: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatena DataFrames completando las columnas faltantes con el dtype categórico de las demás.
+
+    Así la columna resultante sigue siendo categórica en lugar de volver a texto.
+    """
+    columnas = list(dict.fromkeys(columna for df in dfs for columna in df.columns))
+    dtypes = {}
+    for df in dfs:
+        for columna, dtype in df.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype):
+                dtypes.setdefault(columna, dtype)
+
+    alineados = []
+    for df in dfs:
+        faltantes = {
+            columna: pd.Series(index=df.index, dtype=dtype)
+            for columna, dtype in dtypes.items() if columna not in df.columns
+        }
+        alineados.append(df.assign(**faltantes) if faltantes else df)
+
+    # Los DataFrames vacíos no aportan filas y sólo alterarían el dtype resultante
+    no_vacios = [df for df in alineados if len(df)] or alineados[:1]
+
+    return pd.concat(no_vacios, ignore_index=True).reindex(columns=columnas)
+
+
+def reporte_memoria(dfs: Dict[str, pd.DataFrame], incluir_diccionarios: bool = True) -> pd.Series:
+    """
+    Devuelve la memoria ocupada por cada DataFrame en MB.
+
+    Las columnas categóricas se cuentan sólo por sus códigos; los diccionarios
+    compartidos se informan una única vez en la fila 'diccionarios compartidos'.
+    """
+    memoria = {}
+    diccionarios = {}
+    for nombre, df in dfs.items():
+        total = 0
+        for columna in df.columns:
+            serie = df[columna]
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                total += serie.cat.codes.nbytes
+                diccionarios[id(serie.dtype.categories)] = serie.dtype.categories
+            else:
+                total += serie.memory_usage(deep=True, index=False)
+        memoria[nombre] = total / 1024 ** 2
+
+    if incluir_diccionarios and diccionarios:
+        memoria['diccionarios compartidos'] = sum(
+            categorias.memory_usage(deep=True) for categorias in diccionarios.values()
+        ) / 1024 ** 2
+
+    return pd.Series(memoria, name='MB')
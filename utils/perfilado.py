@@ -0,0 +1,27 @@
+import time
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+
+def medir_etapa(funcion: Callable, *args, **kwargs) -> Tuple[Any, float, int]:
+    """
+    Ejecuta una etapa midiendo su duración y el pico de memoria que reserva.
+
+    Returns:
+        Tuple[Any, float, int]: Resultado de la etapa, segundos y pico de memoria en bytes
+    """
+    ya_midiendo = tracemalloc.is_tracing()
+    if not ya_midiendo:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    memoria_inicial = tracemalloc.get_traced_memory()[0]
+
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    segundos = time.perf_counter() - inicio
+
+    pico = tracemalloc.get_traced_memory()[1] - memoria_inicial
+    if not ya_midiendo:
+        tracemalloc.stop()
+
+    return resultado, segundos, pico